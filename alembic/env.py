@@ -26,6 +26,14 @@ from app.db.models import *  # noqa
 
 target_metadata = Base.metadata
 
+# Schema objects created by migrations but not mapped on the models
+# (Postgres full-text search). Autogenerate must not drop them.
+UNMAPPED_SCHEMA_OBJECTS = {"search_vector", "ix_post_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in UNMAPPED_SCHEMA_OBJECTS)
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -43,7 +51,12 @@ def run_migrations_offline():
     script output.
     """
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -54,6 +67,7 @@ def do_run_migrations(connection):
         connection=connection,
         target_metadata=target_metadata,
         render_as_batch=True,  # Required for SQLite migrations
+        include_object=include_object,
     )
 
     with context.begin_transaction():
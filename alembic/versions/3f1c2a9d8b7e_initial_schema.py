@@ -0,0 +1,70 @@
+"""initial schema
+
+Revision ID: 3f1c2a9d8b7e
+Revises:
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9d8b7e"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "account",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("fullname", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_account_email"), "account", ["email"], unique=True)
+    op.create_index(op.f("ix_account_fullname"), "account", ["fullname"], unique=False)
+    op.create_index(op.f("ix_account_id"), "account", ["id"], unique=False)
+    op.create_table(
+        "board",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("public", sa.Boolean(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.Column("post_count", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["owner_id"], ["account.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_board_id"), "board", ["id"], unique=False)
+    op.create_index(op.f("ix_board_name"), "board", ["name"], unique=True)
+    op.create_table(
+        "post",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("board_id", sa.Integer(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["board_id"], ["board.id"]),
+        sa.ForeignKeyConstraint(["owner_id"], ["account.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_post_id"), "post", ["id"], unique=False)
+    op.create_index(op.f("ix_post_title"), "post", ["title"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_post_title"), table_name="post")
+    op.drop_index(op.f("ix_post_id"), table_name="post")
+    op.drop_table("post")
+    op.drop_index(op.f("ix_board_name"), table_name="board")
+    op.drop_index(op.f("ix_board_id"), table_name="board")
+    op.drop_table("board")
+    op.drop_index(op.f("ix_account_id"), table_name="account")
+    op.drop_index(op.f("ix_account_fullname"), table_name="account")
+    op.drop_index(op.f("ix_account_email"), table_name="account")
+    op.drop_table("account")
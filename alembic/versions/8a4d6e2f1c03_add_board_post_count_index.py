@@ -0,0 +1,27 @@
+"""add board (post_count, id) index
+
+Revision ID: 8a4d6e2f1c03
+Revises: 3f1c2a9d8b7e
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4d6e2f1c03"
+down_revision: Union[str, None] = "3f1c2a9d8b7e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination for /boards?order_by_post_count=true
+    op.create_index(
+        "ix_board_post_count_id", "board", ["post_count", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_board_post_count_id", table_name="board")
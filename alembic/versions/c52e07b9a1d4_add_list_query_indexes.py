@@ -0,0 +1,39 @@
+"""add composite indexes for list queries
+
+Revision ID: c52e07b9a1d4
+Revises: 8a4d6e2f1c03
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c52e07b9a1d4"
+down_revision: Union[str, None] = "8a4d6e2f1c03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # get_posts_by_board: board_id = ? AND id > ? ORDER BY id
+    op.create_index("ix_post_board_id_id", "post", ["board_id", "id"], unique=False)
+    # get_boards: the "owner_id = ?" and "public" halves of the listing filter
+    op.create_index("ix_board_owner_id_id", "board", ["owner_id", "id"], unique=False)
+    op.create_index(
+        "ix_board_public_id",
+        "board",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("public"),
+        sqlite_where=sa.text("public"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_board_public_id", table_name="board")
+    op.drop_index("ix_board_owner_id_id", table_name="board")
+    op.drop_index("ix_post_board_id_id", table_name="post")
@@ -0,0 +1,34 @@
+"""add partial (post_count, id) index on public boards
+
+Revision ID: e7b3f90c4a12
+Revises: c52e07b9a1d4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b3f90c4a12"
+down_revision: Union[str, None] = "c52e07b9a1d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Public-board stream of get_boards(order_by_post_count=True)
+    op.create_index(
+        "ix_board_public_post_count_id",
+        "board",
+        ["post_count", "id"],
+        unique=False,
+        postgresql_where=sa.text("public"),
+        sqlite_where=sa.text("public"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_board_public_post_count_id", table_name="board")
@@ -0,0 +1,41 @@
+"""add generated tsvector column and GIN index for post search
+
+Revision ID: f1d8a6c3b590
+Revises: e7b3f90c4a12
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1d8a6c3b590"
+down_revision: Union[str, None] = "e7b3f90c4a12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Postgres only. The column is not mapped on Post; env.py tells
+    # autogenerate to leave it alone. The text search config must match
+    # SEARCH_TEXT_CONFIG in app/repositories/post.py.
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute(
+        """
+        ALTER TABLE post ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX ix_post_search_vector ON post USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX ix_post_search_vector")
+    op.execute("ALTER TABLE post DROP COLUMN search_vector")
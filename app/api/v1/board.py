@@ -1,58 +1,97 @@
-from typing import Optional
+from typing import Optional, Union
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models import Account
-from app.db.session import get_db
-from app.dependencies import get_current_account
-from app.schemas.board import BoardCreate, BoardList, BoardOut, BoardUpdate
+from app.dependencies import (
+    get_current_account,
+    get_read_db,
+    get_write_db,
+    query_budget,
+)
+from app.schemas.board import (
+    BoardBatchGet,
+    BoardCreate,
+    BoardList,
+    BoardOut,
+    BoardUpdate,
+)
 from app.services.board import (
     create_board_service,
     delete_board_service,
     get_board_service,
+    get_boards_by_ids_service,
     list_boards_service,
     update_board_service,
 )
+from app.services.post import export_posts_service
+from app.utils.ids import parse_ids
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
 
-@router.post("/board", response_model=BoardOut)
+@router.post("/board", response_model=BoardOut, dependencies=[query_budget(3)])
 async def create_new_board(
     board: BoardCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1)
     return await create_board_service(board, current_user.id, db)
 
 
-@router.get("/board/{board_id}", response_model=BoardOut)
+@router.get(
+    "/board/{board_id}", response_model=BoardOut, dependencies=[query_budget(2)]
+)
 async def read_board(
     board_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) + O(1) = O(1)
     return await get_board_service(board_id, current_user.id, db)
 
 
-@router.put("/board/{board_id}", response_model=BoardOut)
+@router.get("/board/{board_id}/export", dependencies=[query_budget(3)])
+async def export_board(
+    board_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Account = Depends(get_current_account),
+    export_format: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+):
+    # 시간 복잡도: O(n), 메모리: O(EXPORT_BATCH_SIZE)
+    chunks = await export_posts_service(board_id, current_user.id, export_format, db)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    filename = f"board-{board_id}.{export_format}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.put(
+    "/board/{board_id}", response_model=BoardOut, dependencies=[query_budget(4)]
+)
 async def update_existing_board(
     board_id: int,
     board: BoardUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) = O(1)
     return await update_board_service(board_id, board, current_user.id, db)
 
 
-@router.delete("/board/{board_id}")
+# 쿼리 예산에는 게시물의 board_id를 비우기 위해 ORM이 게시물을 읽는 쿼리가 포함됩니다.
+@router.delete("/board/{board_id}", dependencies=[query_budget(5)])
 async def delete_existing_board(
     board_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) = O(1)
@@ -60,17 +99,32 @@ async def delete_existing_board(
     return {"message": "Board deleted"}
 
 
-@router.get("/boards", response_model=BoardList)
+@router.get(
+    "/boards",
+    response_model=Union[BoardList, BoardBatchGet],
+    dependencies=[query_budget(3)],
+)
 async def list_boards(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Account = Depends(get_current_account),
     limit: int = Query(10, le=100),
-    cursor: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
     offset: int = Query(0, ge=0),
     order_by_post_count: bool = Query(False),
+    include_total: bool = Query(True),
+    ids: Optional[str] = Query(None, description="Comma-separated board ids"),
 ):
-    # 시간 복잡도: O(n) 또는 O(log n) (커서를 사용하는 경우)
+    if ids is not None:
+        # 시간 복잡도: O(k log n) (IN 쿼리 1회)
+        board_ids = parse_ids(ids, settings.BATCH_GET_MAX_IDS)
+        return await get_boards_by_ids_service(board_ids, current_user.id, db)
+
+    # 시간 복잡도: O(log n + limit) (키셋 페이지네이션)
     total, boards, next_cursor = await list_boards_service(
-        current_user.id, limit, cursor, offset, db, order_by_post_count
+        current_user.id, limit, cursor, offset, db, order_by_post_count, include_total
     )
-    return {"boards": boards, "total": total, "next_cursor": next_cursor}
+    page = {"boards": boards, "total": total, "next_cursor": next_cursor}
+    if settings.FAST_JSON_RESPONSES:
+        # 저장소가 BoardOut 필드만 담은 dict를 반환하므로 response_model 검증을 건너뜁니다.
+        return FastJSONResponse(page)
+    return page
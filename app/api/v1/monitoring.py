@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+from app.core.security import password_hasher
+from app.db.session import engine, pool_stats, replica_engine
+
+# Internal endpoints, served at the root (/metrics is where Prometheus scrapes
+# by default) and kept out of the public /api/v1 API and its schema. Expose
+# them only on the internal network.
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    # 시간 복잡도: O(메트릭 수)
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@metrics_router.get("/monitoring/password-hasher", include_in_schema=False)
+async def read_password_hasher_stats():
+    # 시간 복잡도: O(1)
+    return password_hasher.stats()
+
+
+@metrics_router.get("/monitoring/db-pool", include_in_schema=False)
+async def read_db_pool_stats():
+    # 시간 복잡도: O(1)
+    stats = {"primary": pool_stats(engine)}
+    if replica_engine is not None:
+        stats["replica"] = pool_stats(replica_engine)
+    return stats
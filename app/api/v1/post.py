@@ -1,58 +1,117 @@
-from typing import Optional
+from typing import Optional, Union
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models import Account
-from app.db.session import get_db
-from app.dependencies import get_current_account
-from app.schemas.post import PostCreate, PostList, PostOut, PostUpdate
+from app.dependencies import (
+    get_current_account,
+    get_read_db,
+    get_write_db,
+    query_budget,
+)
+from app.schemas.post import (
+    PostBatchCreate,
+    PostBatchGet,
+    PostBatchResult,
+    PostCreate,
+    PostList,
+    PostOut,
+    PostSearchResult,
+    PostSummaryList,
+    PostUpdate,
+)
 from app.services.post import (
+    bulk_create_posts_service,
     create_post_service,
     delete_post_service,
     get_post_service,
+    get_posts_by_ids_service,
     list_posts_service,
+    search_posts_service,
     update_post_service,
 )
+from app.utils.exceptions import raise_bad_request
+from app.utils.ids import parse_ids
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
 
-@router.post("/post", response_model=PostOut)
+@router.post("/post", response_model=PostOut, dependencies=[query_budget(4)])
 async def create_new_post(
     post: PostCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) = O(1)
     return await create_post_service(post, current_user.id, db)
 
 
-@router.get("/post/{post_id}", response_model=PostOut)
+# Postgres에서는 4회. RETURNING이 없는 SQLite에서는 행마다 INSERT합니다.
+@router.post(
+    "/posts:batch", response_model=PostBatchResult, dependencies=[query_budget(5)]
+)
+async def create_posts_batch(
+    batch: PostBatchCreate,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: Account = Depends(get_current_account),
+):
+    # 시간 복잡도: O(n) (게시판 조회 1회 + INSERT 1회 + UPDATE 1회)
+    return await bulk_create_posts_service(batch, current_user.id, db)
+
+
+@router.get(
+    "/posts/search",
+    response_model=PostSearchResult,
+    dependencies=[query_budget(2)],
+    description=(
+        "Posts matching q, best match first. next_cursor is a (score, id) "
+        "position, not a snapshot. With SEARCH_BACKEND=memory, BM25 scores "
+        "depend on every indexed post, so posts created or deleted between "
+        "pages can make later pages skip or repeat results."
+    ),
+)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Account = Depends(get_current_account),
+    limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None),
+):
+    # 시간 복잡도: O(log n + m) (GIN 인덱스, m = 일치하는 게시물 수)
+    posts, next_cursor = await search_posts_service(
+        q, current_user.id, limit, cursor, db
+    )
+    return {"posts": posts, "next_cursor": next_cursor}
+
+
+@router.get("/post/{post_id}", response_model=PostOut, dependencies=[query_budget(2)])
 async def read_post(
     post_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) + O(1) = O(1)
     return await get_post_service(post_id, current_user.id, db)
 
 
-@router.put("/post/{post_id}", response_model=PostOut)
+@router.put("/post/{post_id}", response_model=PostOut, dependencies=[query_budget(4)])
 async def update_existing_post(
     post_id: int,
     post: PostUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) + O(1) = O(1)
     return await update_post_service(post_id, post, current_user.id, db)
 
 
-@router.delete("/post/{post_id}")
+@router.delete("/post/{post_id}", dependencies=[query_budget(4)])
 async def delete_existing_post(
     post_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: Account = Depends(get_current_account),
 ):
     # 시간 복잡도: O(1) + O(1) + O(1) = O(1)
@@ -60,16 +119,44 @@ async def delete_existing_post(
     return {"message": "Post deleted"}
 
 
-@router.get("/posts", response_model=PostList)
+@router.get(
+    "/posts",
+    response_model=Union[PostList, PostSummaryList, PostBatchGet],
+    dependencies=[query_budget(3)],
+)
 async def list_posts(
-    board_id: int,
-    db: AsyncSession = Depends(get_db),
+    board_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: Account = Depends(get_current_account),
     limit: int = Query(10, le=100),
     cursor: Optional[int] = Query(None),
+    include_total: bool = Query(True),
+    ids: Optional[str] = Query(None, description="Comma-separated post ids"),
+    fields: str = Query(
+        "full",
+        regex="^(full|summary)$",
+        description="summary: excerpt instead of content (board listing only)",
+    ),
 ):
+    if ids is not None:
+        # 시간 복잡도: O(k log n) (IN 쿼리 1회)
+        post_ids = parse_ids(ids, settings.BATCH_GET_MAX_IDS)
+        return await get_posts_by_ids_service(post_ids, current_user.id, db)
+    if board_id is None:
+        raise_bad_request("board_id or ids is required", code=4006)
+
     # 시간 복잡도: O(log n) (커서를 사용하는 경우)
     total, posts, next_cursor = await list_posts_service(
-        board_id, current_user.id, limit, cursor, db
+        board_id,
+        current_user.id,
+        limit,
+        cursor,
+        db,
+        include_total,
+        summary=fields == "summary",
     )
-    return {"posts": posts, "total": total, "next_cursor": next_cursor}
+    page = {"posts": posts, "total": total, "next_cursor": next_cursor}
+    if settings.FAST_JSON_RESPONSES:
+        # 저장소가 PostOut/PostSummary 필드만 담은 dict를 반환하므로 response_model 검증을 건너뜁니다.
+        return FastJSONResponse(page)
+    return page
@@ -1,13 +1,94 @@
+from typing import List, Optional
+
 from pydantic import BaseSettings
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional read replica for GET endpoints; writes always use DATABASE_URL
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # After a write, the same user keeps reading from the primary this long
+    DB_REPLICA_STICKY_SECONDS: int = 5
     REDIS_URL: str
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     ALGORITHM: str
 
+    # Database engine and connection pool
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # Opt-in: adds a SELECT 1 round trip to every checkout. Stale connections
+    # are otherwise replaced by DB_POOL_RECYCLE; enable it only when
+    # something closes idle connections sooner (e.g. a proxy idle timeout).
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the server-side timeout
+    # Log requests that exceed their route's query budget or repeat a
+    # statement (N+1). Meant for development.
+    QUERY_BUDGET_WARNINGS: bool = False
+
+    # Per-worker cache of verified tokens used by get_current_account
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 60
+
+    # Read-through Redis cache for board/post detail lookups
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_LOCK_TIMEOUT_MS: int = 2000
+
+    # "atomic": UPDATE board.post_count with every post write
+    # "buffered": INCRBY in Redis, folded into board.post_count periodically
+    POST_COUNT_MODE: str = "atomic"
+    POST_COUNT_FLUSH_INTERVAL_SECONDS: float = 5.0
+
+    # Per-user board totals for /boards are cached instead of counted per page
+    BOARD_TOTAL_CACHE_TTL_SECONDS: int = 30
+
+    # POST /posts:batch
+    POST_BATCH_MAX_SIZE: int = 5000
+    POST_BATCH_INSERT_CHUNK_SIZE: int = 1000
+    # GET /posts?ids= and GET /boards?ids=
+    BATCH_GET_MAX_IDS: int = 100
+    # Characters of content returned as the excerpt by GET /posts?fields=summary
+    POST_EXCERPT_LENGTH: int = 200
+    # Rows fetched from the server-side cursor per chunk in /board/{id}/export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # GET /posts/search backend
+    # "postgres": tsvector + GIN index (see the f1d8a6c3b590 migration)
+    # "memory": per-worker BM25 index, for SQLite and other databases
+    SEARCH_BACKEND: str = "postgres"
+
+    # /boards and /posts pages are returned as FastJSONResponse: the column
+    # dicts from the repositories skip response_model validation and are
+    # serialized with orjson when it is installed (poetry install -E orjson)
+    FAST_JSON_RESPONSES: bool = False
+
+    # Password hashing policy. Hashes made under another scheme or cost are
+    # upgraded on the next successful login.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" or "argon2"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_TIME_COST: int = 3
+    ARGON2_PARALLELISM: int = 4
+
+    # Password hashing runs on a bounded executor ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Reverse proxies / load balancers (IPs or CIDRs, e.g. ["10.0.0.0/8"]).
+    # Requests from them are attributed to the client in X-Forwarded-For.
+    TRUSTED_PROXIES: List[str] = []
+
+    # Login throttling (sliding windows in Redis) and per-worker admission
+    LOGIN_ATTEMPTS_PER_IP: int = 100
+    LOGIN_IP_WINDOW_SECONDS: int = 60
+    LOGIN_FAILURES_PER_EMAIL: int = 10
+    LOGIN_EMAIL_WINDOW_SECONDS: int = 300
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = 16
+
     class Config:
         env_file = ".env"
 
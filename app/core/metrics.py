@@ -0,0 +1,281 @@
+import logging
+import os
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.core.security import password_hasher
+from app.db.session import engine, pool_stats, replica_engine
+
+REQUEST_COUNT = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "DB queries issued per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in DB queries per request", ["route"]
+)
+REQUEST_REDIS_COMMANDS = Histogram(
+    "http_request_redis_commands",
+    "Redis round trips per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50),
+)
+REQUEST_REDIS_SECONDS = Histogram(
+    "http_request_redis_seconds", "Time spent in Redis per request", ["route"]
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "http_request_query_budget_exceeded_total",
+    "Requests that ran more DB queries than their route's budget",
+    ["route"],
+)
+
+logger = logging.getLogger(__name__)
+
+# The same statement run this many times in one request is reported as N+1
+REPEATED_STATEMENT_THRESHOLD = 5
+
+
+class RequestStats:
+    """DB and Redis work done on behalf of the current request."""
+
+    __slots__ = (
+        "db_queries",
+        "db_seconds",
+        "redis_commands",
+        "redis_seconds",
+        "statements",
+        "query_budget",
+    )
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.redis_commands = 0
+        self.redis_seconds = 0.0
+        self.statements = StatementCounter()
+        # Set by the route's query_budget dependency
+        self.query_budget: Optional[int] = None
+
+
+# Set by MetricsMiddleware; the object is mutated in place so updates made in
+# dependencies and handlers are visible to the middleware afterwards.
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # One statement runs at a time per connection; a failed statement never
+    # reaches after_cursor_execute, so keep a single slot instead of a stack.
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info.pop("query_started_at")
+    stats = request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - started_at
+        stats.statements[statement] += 1
+
+
+# Called with every budget violation; the functional tests register one
+query_budget_listeners: List[Callable[[dict], None]] = []
+
+
+def check_query_budget(route: str, stats: RequestStats) -> None:
+    violations = []
+    if stats.query_budget is not None and stats.db_queries > stats.query_budget:
+        QUERY_BUDGET_EXCEEDED.labels(route).inc()
+        violations.append(
+            {
+                "route": route,
+                "queries": stats.db_queries,
+                "budget": stats.query_budget,
+            }
+        )
+    if stats.statements:
+        statement, count = stats.statements.most_common(1)[0]
+        if count >= REPEATED_STATEMENT_THRESHOLD:
+            violations.append({"route": route, "statement": statement, "count": count})
+
+    for violation in violations:
+        if settings.QUERY_BUDGET_WARNINGS:
+            logger.warning("Query budget exceeded: %s", violation)
+        for listener in query_budget_listeners:
+            listener(violation)
+
+
+def _record_redis(started_at: float) -> None:
+    stats = request_stats.get()
+    if stats is not None:
+        stats.redis_commands += 1
+        stats.redis_seconds += time.perf_counter() - started_at
+
+
+def instrument_redis(client):
+    # 클라이언트 인스턴스의 명령 실행과 파이프라인 실행 시간을 요청 통계에 더합니다.
+    execute_command = client.execute_command
+    pipeline = client.pipeline
+
+    async def timed_execute_command(*args, **options):
+        started_at = time.perf_counter()
+        try:
+            return await execute_command(*args, **options)
+        finally:
+            _record_redis(started_at)
+
+    def timed_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def timed_execute(*execute_args, **execute_kwargs):
+            started_at = time.perf_counter()
+            try:
+                return await execute(*execute_args, **execute_kwargs)
+            finally:
+                _record_redis(started_at)
+
+        pipe.execute = timed_execute
+        return pipe
+
+    client.execute_command = timed_execute_command
+    client.pipeline = timed_pipeline
+    return client
+
+
+def route_label(app, scope) -> str:
+    # 경로 템플릿(/api/v1/post/{post_id})으로 묶어 레이블 수가 늘어나지 않게 합니다.
+    route = scope.get("route")
+    if route is None:
+        for candidate in app.router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and DB/Redis work per route.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so streamed
+    responses are timed until their last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestStats()
+        token = request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            request_stats.reset(token)
+            route = route_label(scope["app"], scope)
+            REQUEST_COUNT.labels(method, route, status_code).inc()
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(route).observe(stats.db_queries)
+            REQUEST_DB_SECONDS.labels(route).observe(stats.db_seconds)
+            REQUEST_REDIS_COMMANDS.labels(route).observe(stats.redis_commands)
+            REQUEST_REDIS_SECONDS.labels(route).observe(stats.redis_seconds)
+            check_query_budget(route, stats)
+
+
+class RuntimeCollector:
+    """Exposes DB pool and password hasher state as gauges at scrape time."""
+
+    def collect(self):
+        pool = GaugeMetricFamily(
+            "db_pool_connections", "DB pool connections", labels=["engine", "state"]
+        )
+        acquire = GaugeMetricFamily(
+            "db_pool_acquire_seconds_max",
+            "Slowest connection checkout",
+            labels=["engine"],
+        )
+        engines = {"primary": engine, "replica": replica_engine}
+        for name, db_engine in engines.items():
+            if db_engine is None:
+                continue
+            stats = pool_stats(db_engine)
+            for state in ("checked_in", "checked_out", "overflow"):
+                if state in stats:
+                    pool.add_metric([name, state], stats[state])
+            if "acquire_seconds_max" in stats:
+                acquire.add_metric([name], stats["acquire_seconds_max"])
+        yield pool
+        yield acquire
+
+        hasher = password_hasher.stats()
+        hasher_tasks = GaugeMetricFamily(
+            "password_hasher_tasks", "Password hashing tasks", labels=["state"]
+        )
+        hasher_tasks.add_metric(["in_flight"], hasher["in_flight"])
+        hasher_tasks.add_metric(["queued"], hasher["queued"])
+        yield hasher_tasks
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+def render_metrics() -> tuple:
+    # With several workers, PROMETHEUS_MULTIPROC_DIR aggregates the request
+    # metrics of all of them; pool/hasher gauges are this worker's only.
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(RuntimeCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
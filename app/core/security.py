@@ -1,11 +1,40 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.utils.exceptions import raise_service_unavailable
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_pwd_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = settings.BCRYPT_ROUNDS,
+    argon2_memory_cost: int = settings.ARGON2_MEMORY_COST,
+    argon2_time_cost: int = settings.ARGON2_TIME_COST,
+    argon2_parallelism: int = settings.ARGON2_PARALLELISM,
+) -> CryptContext:
+    # 새 해시는 scheme으로 만들고, 다른 scheme이나 다른 비용으로 만든 기존 해시는
+    # 검증은 되지만 needs_update로 표시되어 로그인할 때 다시 해시됩니다.
+    # argon2는 argon2-cffi가 설치되어 있어야 합니다. (poetry install -E argon2)
+    schemes = [scheme] + [other for other in PASSWORD_HASH_SCHEMES if other != scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__time_cost=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_pwd_context()
 ALGORITHM = "HS256"
 
 
@@ -18,6 +47,101 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# Time complexity: O(1)
+def verify_and_update_password(plain_password, hashed_password):
+    # (검증 결과, 현재 정책으로 다시 만든 해시 또는 None)
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Runs CPU-bound password hashing off the event loop.
+
+    bcrypt releases the GIL, so a small thread pool is enough by default;
+    PASSWORD_HASH_EXECUTOR=process switches to a process pool. Work beyond
+    max_pending outstanding calls is rejected with a 503 instead of
+    queueing without bound.
+    """
+
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise_service_unavailable("Server is busy, please retry", code=5031)
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_seconds": self.total_seconds / self.completed
+            if self.completed
+            else 0.0,
+            "max_seconds": self.max_seconds,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_EXECUTOR,
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password, hashed_password):
+    return await password_hasher.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
 # Time complexity: O(1)
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
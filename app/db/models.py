@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -28,6 +28,27 @@ class Board(Base):
     owner = relationship("Account", back_populates="boards")
     posts = relationship("Post", back_populates="board")
 
+    __table_args__ = (
+        # get_boards(order_by_post_count=True)의 키셋 페이지네이션용
+        Index("ix_board_post_count_id", "post_count", "id"),
+        # owner_id = ? OR public 조건의 두 갈래를 각각 범위 스캔하기 위한 인덱스
+        Index("ix_board_owner_id_id", "owner_id", "id"),
+        Index(
+            "ix_board_public_id",
+            "id",
+            postgresql_where=text("public"),
+            sqlite_where=text("public"),
+        ),
+        # get_boards의 공개 게시판 갈래를 post_count 순으로 읽기 위한 인덱스
+        Index(
+            "ix_board_public_post_count_id",
+            "post_count",
+            "id",
+            postgresql_where=text("public"),
+            sqlite_where=text("public"),
+        ),
+    )
+
 
 class Post(Base):
     __tablename__ = "post"
@@ -40,3 +61,8 @@ class Post(Base):
 
     board = relationship("Board", back_populates="posts")
     owner = relationship("Account", back_populates="posts")
+
+    __table_args__ = (
+        # get_posts_by_board의 board_id = ? AND id > ? ORDER BY id 용
+        Index("ix_post_board_id_id", "board_id", "id"),
+    )
@@ -0,0 +1,7 @@
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.metrics import instrument_redis
+
+# Redis 클라이언트 초기화 (명령 시간은 요청별 메트릭에 기록됩니다)
+redis_client = instrument_redis(redis.from_url(settings.REDIS_URL))
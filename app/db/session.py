@@ -1,16 +1,118 @@
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
+DATABASE_REPLICA_URL = settings.DATABASE_REPLICA_URL
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that also records how long checkouts took.
+
+    The time covers waiting for a free connection as well as opening a new
+    one when the pool grows.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.checkouts += 1
+            self.acquire_seconds_total += elapsed
+            self.acquire_seconds_max = max(self.acquire_seconds_max, elapsed)
+
+
+def engine_options(url: str) -> dict:
+    options = {"echo": settings.DB_ECHO}
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        # SQLite는 풀 설정을 사용하지 않습니다.
+        return options
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "server_settings": {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+            }
+        }
+    return options
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.sync_engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            acquire_seconds_total=pool.acquire_seconds_total,
+            acquire_seconds_max=pool.acquire_seconds_max,
+        )
+    return stats
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 AsyncSessionLocal = sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# 읽기 전용 복제본 (설정된 경우에만)
+replica_engine = None
+ReplicaSessionLocal = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(
+        DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL)
+    )
+    ReplicaSessionLocal = sessionmaker(
+        bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
 
 async def get_db():
+    # The session checks out a pool connection only on its first query, and
+    # FastAPI caches this dependency, so auth and the handler share it.
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def release_connection(session: AsyncSession) -> None:
+    # Return the session's connection to the pool as soon as its last query
+    # is done instead of holding it until the response has been sent.
+    # Writes are committed by the repositories, so there is nothing to commit
+    # here; close() ends the read transaction without a COMMIT round trip and
+    # leaves the loaded objects readable as detached instances.
+    if session.in_transaction():
+        await session.close()
@@ -1,17 +1,80 @@
-from fastapi import Depends, HTTPException, status
+import ipaddress
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.metrics import request_stats
+from app.db.models import Account
+from app.db.session import ReplicaSessionLocal, get_db
 from app.repositories.account import AccountRepository
+from app.repositories.cache import primary_sticky_key
 from app.schemas.account import TokenData
-from app.services.auth import oauth2_scheme, redis_client
+from app.services.auth import (
+    cache_verified_token,
+    get_cached_account,
+    oauth2_scheme,
+    redis_client,
+    session_generation,
+)
+
+
+async def get_replica_db(db: AsyncSession = Depends(get_db)):
+    # 복제본이 설정되지 않았으면 primary 세션을 그대로 사용합니다.
+    if ReplicaSessionLocal is None:
+        yield db
+        return
+    async with ReplicaSessionLocal() as session:
+        yield session
+
+
+@lru_cache(maxsize=8)
+def trusted_proxy_networks(proxies: tuple) -> tuple:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address.strip())
+    except ValueError:
+        return False
+    networks = trusted_proxy_networks(tuple(settings.TRUSTED_PROXIES))
+    return any(ip in network for network in networks)
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    # 시간 복잡도: O(h), h = X-Forwarded-For의 주소 수
+    # 신뢰하는 프록시에서 온 요청만 X-Forwarded-For를 따릅니다. 오른쪽(가장 가까운 홉)부터
+    # 신뢰하는 프록시를 건너뛰고 처음 나오는 주소가 클라이언트입니다. 그보다 왼쪽은
+    # 클라이언트가 마음대로 넣을 수 있으므로 보지 않습니다.
+    if request.client is None:
+        return None
+    client_ip = request.client.host
+    if not is_trusted_proxy(client_ip):
+        return client_ip
+    forwarded_for = ",".join(request.headers.getlist("x-forwarded-for"))
+    for hop in reversed(
+        [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    ):
+        client_ip = hop
+        if not is_trusted_proxy(hop):
+            break
+    return client_ip
 
 
 async def get_current_account(
-    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+    db: AsyncSession = Depends(get_replica_db),
+    primary_db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
 ):
+    # A token verified a moment ago skips the JWT decode, Redis and DB lookup
+    account = get_cached_account(token)
+    if account is not None:
+        return account
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,9 +92,20 @@ async def get_current_account(
         raise credentials_exception
 
     # Check Redis for the session
+    generation = session_generation()
     redis_token = await redis_client.get(f"session:{account_id}")
     if redis_token:
-        return await AccountRepository.get_by_id(db, account_id=token_data.account_id)
+        account = await AccountRepository.get_by_id(
+            db, account_id=token_data.account_id
+        )
+        if account is None and db is not primary_db:
+            # 방금 가입한 계정이 아직 복제본에 없을 수 있습니다.
+            account = await AccountRepository.get_by_id(
+                primary_db, account_id=token_data.account_id
+            )
+        if account is not None:
+            cache_verified_token(token, account, payload["exp"], generation)
+        return account
 
     # Check the database if Redis session is not found
     account = await AccountRepository.get_by_id(db, account_id=token_data.account_id)
@@ -41,3 +115,34 @@ async def get_current_account(
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired or invalid"
     )
+
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    replica_db: AsyncSession = Depends(get_replica_db),
+    current_user: Account = Depends(get_current_account),
+):
+    # 읽기 전용 핸들러용 세션. 최근에 쓰기를 한 사용자는 잠시 primary에서 읽습니다.
+    if replica_db is db or await redis_client.exists(
+        primary_sticky_key(current_user.id)
+    ):
+        yield db
+    else:
+        yield replica_db
+
+
+async def get_write_db(db: AsyncSession = Depends(get_db)):
+    # 쓰기 핸들러용 primary 세션. 쓰기가 커밋되면 서비스가 mark_primary_sticky로
+    # 이후 읽기를 primary로 보냅니다.
+    return db
+
+
+def query_budget(max_queries: int):
+    # 라우트 데코레이터의 dependencies=[query_budget(n)]으로 선언합니다.
+    # 토큰 캐시와 Redis 캐시가 모두 빗나간 최악의 경우를 기준으로 합니다.
+    def declare_query_budget():
+        stats = request_stats.get()
+        if stats is not None:
+            stats.query_budget = max_queries
+
+    return Depends(declare_query_budget)
@@ -1,13 +1,48 @@
+import asyncio
+
 from fastapi import FastAPI
 
 from app.api.v1.account import router as account_router
 from app.api.v1.board import router as board_router
+from app.api.v1.monitoring import metrics_router
 from app.api.v1.post import router as post_router
+from app.core.metrics import MetricsMiddleware
+from app.core.security import password_hasher
+from app.repositories.counter import post_count_buffer
+from app.repositories.search import post_search_index
+from app.services.auth import listen_session_invalidations
+from app.services.board import flush_post_counts_service, run_post_count_flusher
 
 app = FastAPI()
+app.add_middleware(MetricsMiddleware)
 
 
 # Include routers
 app.include_router(account_router, prefix="/api/v1", tags=["account"])
 app.include_router(board_router, prefix="/api/v1", tags=["board"])
 app.include_router(post_router, prefix="/api/v1", tags=["post"])
+app.include_router(metrics_router, tags=["monitoring"])
+
+
+background_tasks: list[asyncio.Task] = []
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    background_tasks.append(asyncio.create_task(listen_session_invalidations()))
+    if post_count_buffer.enabled():
+        background_tasks.append(asyncio.create_task(run_post_count_flusher()))
+    if post_search_index.enabled():
+        background_tasks.append(asyncio.create_task(post_search_index.listen()))
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    if post_count_buffer.enabled():
+        # Don't leave buffered deltas behind when the worker goes away
+        await flush_post_counts_service()
+    password_hasher.shutdown()
@@ -1,7 +1,8 @@
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.db.models import Account
 from app.schemas.account import AccountCreate
 
@@ -25,7 +26,7 @@ class AccountRepository:
     async def create(db: AsyncSession, account: AccountCreate) -> Account:
         # 시간 복잡도: O(1)
         # 데이터베이스에 새로운 레코드를 추가하는 작업은 시간 복잡도가 O(1)입니다.
-        hashed_password = get_password_hash(account.password)
+        hashed_password = await get_password_hash_async(account.password)
         db_account = Account(
             email=account.email,
             hashed_password=hashed_password,
@@ -35,3 +36,15 @@ class AccountRepository:
         await db.commit()
         await db.refresh(db_account)
         return db_account
+
+    @staticmethod
+    async def update_password_hash(
+        db: AsyncSession, account_id: int, hashed_password: str
+    ) -> None:
+        # 시간 복잡도: O(1)
+        await db.execute(
+            update(Account)
+            .where(Account.id == account_id)
+            .values(hashed_password=hashed_password)
+        )
+        await db.commit()
@@ -1,10 +1,23 @@
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select, tuple_, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config import settings
 from app.db.models import Board
-from app.schemas.board import BoardCreate, BoardUpdate
+from app.db.redis import redis_client
+from app.repositories.cache import ReadThroughCache
+from app.repositories.counter import post_count_buffer
+from app.schemas.board import BoardCreate, BoardOut, BoardUpdate
+from app.utils.cursor import decode_cursor, encode_cursor
+
+board_cache = ReadThroughCache("board", BoardOut)
+
+# 목록에서 읽는 컬럼. post_count는 buffered 모드의 증감분을 더해야 하므로 따로 선택합니다.
+BOARD_OUT_COLUMNS = tuple(
+    getattr(Board, field) for field in BoardOut.__fields__ if field != "post_count"
+)
 
 
 class BoardRepository:
@@ -15,13 +28,45 @@ class BoardRepository:
         db.add(db_board)
         await db.commit()
         await db.refresh(db_board)
+        await redis_client.delete(BoardRepository.board_total_key(user_id))
         return db_board
 
     @staticmethod
     async def get_board(db: AsyncSession, board_id: int) -> Board:
         # 시간 복잡도: O(1)
-        result = await db.execute(select(Board).filter(Board.id == board_id))
-        return result.scalars().first()
+        # 같은 세션에서 이미 불러온 게시판이면 쿼리 없이 identity map에서 반환합니다.
+        return await db.get(Board, board_id)
+
+    @staticmethod
+    async def get_boards_by_ids(
+        db: AsyncSession, board_ids: Iterable[int]
+    ) -> Dict[int, Board]:
+        # 시간 복잡도: O(k log n), k = 게시판 수
+        # 여러 게시판을 IN 쿼리 한 번으로 가져옵니다.
+        board_ids = set(board_ids)
+        if not board_ids:
+            return {}
+        result = await db.execute(select(Board).filter(Board.id.in_(board_ids)))
+        boards = result.scalars().all()
+        await BoardRepository.merge_pending_post_counts(boards)
+        return {board.id: board for board in boards}
+
+    @staticmethod
+    async def get_board_cached(db: AsyncSession, board_id: int) -> Optional[BoardOut]:
+        # 시간 복잡도: O(1)
+        # 읽기 전용 경로에서 사용합니다. 수정이 필요한 경우 get_board를 사용하세요.
+        async def load():
+            db_board = await BoardRepository.get_board(db, board_id)
+            return BoardOut.from_orm(db_board) if db_board else None
+
+        board = await board_cache.get(board_id, load)
+        if board is not None and post_count_buffer.enabled():
+            pending = await post_count_buffer.pending([board_id])
+            if pending:
+                board = board.copy(
+                    update={"post_count": board.post_count + pending[board_id]}
+                )
+        return board
 
     @staticmethod
     async def update_board(
@@ -34,6 +79,8 @@ class BoardRepository:
             db_board.public = board.public
             await db.commit()
             await db.refresh(db_board)
+            await board_cache.invalidate(board_id)
+            await redis_client.delete(BoardRepository.board_total_key(user_id))
         return db_board
 
     @staticmethod
@@ -43,68 +90,173 @@ class BoardRepository:
         if db_board and db_board.owner_id == user_id:
             await db.delete(db_board)
             await db.commit()
+            await board_cache.invalidate(board_id)
+            await redis_client.delete(BoardRepository.board_total_key(user_id))
 
     @staticmethod
-    async def increment_post_count(db: AsyncSession, board_id: int):
+    async def increment_post_count(db: AsyncSession, board_id: int, amount: int = 1):
         # 시간 복잡도: O(1)
-        db_board = await BoardRepository.get_board(db, board_id)
-        if db_board:
-            db_board.post_count += 1
-            await db.commit()
+        # 호출한 쪽의 트랜잭션 안에서 SQL로 원자적으로 증가시킵니다. 커밋은 호출한 쪽의 몫입니다.
+        # buffered 모드에서는 커밋 후 post_count_changed가 Redis에 기록합니다.
+        if post_count_buffer.enabled():
+            return
+        await db.execute(
+            update(Board)
+            .where(Board.id == board_id)
+            .values(post_count=Board.post_count + amount)
+        )
 
     @staticmethod
-    async def decrement_post_count(db: AsyncSession, board_id: int):
+    async def increment_post_counts(db: AsyncSession, amounts: Dict[int, int]):
+        # 시간 복잡도: O(k), k = 게시판 수
+        # 여러 게시판의 post_count를 CASE 식 UPDATE 한 번으로 조정합니다.
+        if post_count_buffer.enabled() or not amounts:
+            return
+        await db.execute(
+            update(Board)
+            .where(Board.id.in_(amounts))
+            .values(
+                post_count=Board.post_count + case(amounts, value=Board.id, else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def decrement_post_count(db: AsyncSession, board_id: int, amount: int = 1):
         # 시간 복잡도: O(1)
-        db_board = await BoardRepository.get_board(db, board_id)
-        if db_board:
-            db_board.post_count -= 1
-            await db.commit()
+        await BoardRepository.increment_post_count(db, board_id, -amount)
+
+    @staticmethod
+    async def post_count_changed(board_id: int, amount: int):
+        # 시간 복잡도: O(1)
+        # 게시물 쓰기가 커밋된 후에 호출합니다.
+        if post_count_buffer.enabled():
+            await post_count_buffer.add(board_id, amount)
+        else:
+            await board_cache.invalidate(board_id)
+
+    @staticmethod
+    async def flush_post_counts(db: AsyncSession):
+        # 시간 복잡도: O(k), k = 마지막 flush 이후 변경된 게시판 수
+        deltas = await post_count_buffer.flush(db)
+        for board_id in deltas:
+            await board_cache.invalidate(board_id)
+        return deltas
+
+    @staticmethod
+    async def merge_pending_post_counts(boards: list[Board]):
+        # 시간 복잡도: O(n)
+        # 아직 flush되지 않은 증감분을 더합니다. 객체를 dirty로 만들지 않도록
+        # set_committed_value를 사용합니다.
+        if not boards or not post_count_buffer.enabled():
+            return
+        pending = await post_count_buffer.pending(board.id for board in boards)
+        for board in boards:
+            if board.id in pending:
+                set_committed_value(
+                    board, "post_count", board.post_count + pending[board.id]
+                )
+
+    @staticmethod
+    def visible_board_streams(user_id: int):
+        # (Board.owner_id == user_id) | Board.public 조건을 서로 겹치지 않는 두 갈래로 나눕니다.
+        # 내 게시판은 ix_board_owner_id_id, 다른 사람의 공개 게시판은 ix_board_public_id로 읽습니다.
+        return (
+            Board.owner_id == user_id,
+            (Board.public == True) & Board.owner_id.is_distinct_from(user_id),
+        )
+
+    @staticmethod
+    def board_total_key(user_id: int) -> str:
+        return f"board_total:{user_id}"
+
+    @staticmethod
+    async def count_boards(db: AsyncSession, user_id: int) -> int:
+        # 시간 복잡도: 캐시 히트 O(1), 미스 O(n)
+        # 다른 사용자의 공개 게시판 변경은 TTL이 지나야 반영되는 근사값입니다.
+        key = BoardRepository.board_total_key(user_id)
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+
+        # 전체 게시판 수를 계산하는 쿼리 (커서를 적용하지 않음)
+        # 목록과 같은 두 갈래로 나누어 각각 인덱스로 셉니다.
+        own_count, public_count = (
+            select(func.count(Board.id)).filter(stream).scalar_subquery()
+            for stream in BoardRepository.visible_board_streams(user_id)
+        )
+        total_result = await db.execute(select(own_count + public_count))
+        total = total_result.scalar()
+        await redis_client.set(key, total, ex=settings.BOARD_TOTAL_CACHE_TTL_SECONDS)
+        return total
 
     @staticmethod
     async def get_boards(
         db: AsyncSession,
         user_id: int,
         limit: int = 10,
-        cursor: Optional[int] = None,
+        cursor: Optional[str] = None,
         offset: int = 0,
         order_by_post_count: bool = False,
-    ) -> (int, list[Board], Optional[int]):
-        # 시간 복잡도: O(n) 또는 O(log n) (커서를 사용하는 경우)
-        # 커서를 사용하지 않는 경우, 전체 결과 집합을 가져오므로 O(n)
-        # 커서를 사용하는 경우, 인덱스를 사용하여 부분 결과 집합을 가져오므로 O(log n)
-        base_query = select(Board).filter(
-            (Board.owner_id == user_id) | (Board.public == True)
-        )
-
-        if cursor:
-            base_query = base_query.filter(Board.id > cursor)
-
-        # 전체 게시판 수를 계산하는 쿼리 (커서를 적용하지 않음)
-        total_query = select(func.count(Board.id)).filter(
-            (Board.owner_id == user_id) | (Board.public == True)
-        )
+        include_total: bool = True,
+    ) -> (Optional[int], List[dict], Optional[str]):
+        # 시간 복잡도: O(log n + limit) (키셋 페이지네이션, 페이지 깊이와 공개 게시판 수와 무관)
+        # 커서는 정렬 키 그대로입니다. id 순: (id), post_count 순: (post_count, id)
+        # ORM 객체 대신 BoardOut 필드만 담은 dict를 반환합니다.
+        total = None
+        if include_total:
+            total = await BoardRepository.count_boards(db, user_id)
 
-        total_result = await db.execute(total_query)
-        total = total_result.scalar()
+        post_count = Board.post_count
+        if post_count_buffer.enabled():
+            # 아직 flush되지 않은 증감분을 SQL에서 더합니다.
+            # 최근에 변경된 게시판만 dirty 집합에 있으므로 CASE 식은 작게 유지됩니다.
+            pending = await post_count_buffer.pending_all()
+            if pending:
+                post_count = post_count + case(pending, value=Board.id, else_=0)
 
         if order_by_post_count:
-            query = (
-                base_query.order_by(Board.post_count.desc(), Board.id)
-                .offset(offset)
-                .limit(limit + 1)
-            )
+            # (post_count, id) 모두 내림차순이어야 row-value 비교와
+            # ix_board_post_count_id 역방향 스캔을 그대로 쓸 수 있습니다.
+            order_by = (post_count.desc(), Board.id.desc())
+            after = decode_cursor(cursor, (int, int))
+            keyset = tuple_(post_count, Board.id) < tuple_(*after) if after else None
         else:
-            query = base_query.order_by(Board.id).offset(offset).limit(limit + 1)
+            order_by = (Board.id,)
+            after = decode_cursor(cursor, (int,))
+            keyset = Board.id > after[0] if after else None
 
-        result = await db.execute(query)
-        boards = result.scalars().all()
+        # 두 갈래를 각각 정렬 순서대로 limit만큼만 읽고 UNION ALL로 합친 뒤
+        # 바깥 쿼리에서 다시 정렬합니다. 갈래가 겹치지 않으므로 중복 제거가 필요 없습니다.
+        window = offset + limit + 1
+        streams = []
+        for stream in BoardRepository.visible_board_streams(user_id):
+            stream_query = select(Board.id).filter(stream)
+            if keyset is not None:
+                stream_query = stream_query.filter(keyset)
+            stream_query = stream_query.order_by(*order_by).limit(window).subquery()
+            streams.append(select(stream_query.c.id))
+        candidates = union_all(*streams).subquery()
 
-        if len(boards) > limit:
-            next_cursor = boards[
-                -2
-            ].id  # If there are more records, use the second last ID as next cursor
-            boards = boards[:-1]  # Remove the last element
-        else:
-            next_cursor = None
+        query = (
+            select(*BOARD_OUT_COLUMNS, post_count.label("post_count"))
+            .join(candidates, Board.id == candidates.c.id)
+            .order_by(*order_by)
+        )
+        if offset:
+            query = query.offset(offset)
+        result = await db.execute(query.limit(limit + 1))
+        boards = [dict(row._mapping) for row in result]
+
+        has_more = len(boards) > limit
+        boards = boards[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = boards[-1]
+            if order_by_post_count:
+                next_cursor = encode_cursor(last["post_count"], last["id"])
+            else:
+                next_cursor = encode_cursor(last["id"])
 
         return total, boards, next_cursor
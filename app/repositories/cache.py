@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Dict, Generic, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# 다른 워커가 값을 채우는 동안 기다리는 간격과 횟수
+LOCK_POLL_INTERVAL = 0.02
+LOCK_POLL_ATTEMPTS = 10
+
+# invalidate()가 복제본 지연 뒤에 한 번 더 지우도록 예약한 작업
+delayed_delete_tasks: set[asyncio.Task] = set()
+
+
+class ReadThroughCache(Generic[SchemaT]):
+    """Redis read-through cache storing one serialized schema per id.
+
+    Misses are coalesced twice: concurrent misses in this worker share one
+    load, and across workers only the holder of a short Redis lock hits the
+    database while the others poll for the refilled key.
+    """
+
+    def __init__(self, prefix: str, schema: Type[SchemaT]):
+        self.prefix = prefix
+        self.schema = schema
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+    def key(self, object_id: int) -> str:
+        return f"cache:{self.prefix}:{object_id}"
+
+    async def get(
+        self, object_id: int, loader: Callable[[], Awaitable[Optional[SchemaT]]]
+    ) -> Optional[SchemaT]:
+        # 시간 복잡도: O(1)
+        cached = await redis_client.get(self.key(object_id))
+        if cached is not None:
+            return self.schema.parse_raw(cached)
+
+        inflight = self._inflight.get(object_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[object_id] = future
+        try:
+            value = await self._load(object_id, loader)
+            future.set_result(value)
+            return value
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Nobody may be waiting on the future; don't warn about it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[object_id]
+
+    async def _load(
+        self, object_id: int, loader: Callable[[], Awaitable[Optional[SchemaT]]]
+    ) -> Optional[SchemaT]:
+        key = self.key(object_id)
+        lock_key = f"{key}:lock"
+        locked = await redis_client.set(
+            lock_key, 1, nx=True, px=settings.CACHE_LOCK_TIMEOUT_MS
+        )
+        if not locked:
+            # Another worker is already loading this key; wait for its result
+            for _ in range(LOCK_POLL_ATTEMPTS):
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                cached = await redis_client.get(key)
+                if cached is not None:
+                    return self.schema.parse_raw(cached)
+
+        try:
+            value = await loader()
+            if value is not None:
+                await self.set(object_id, value)
+            return value
+        finally:
+            if locked:
+                await redis_client.delete(lock_key)
+
+    async def set(self, object_id: int, value: SchemaT) -> None:
+        # Jitter the TTL so keys filled together don't all expire together
+        ttl = settings.CACHE_TTL_SECONDS
+        ttl += random.randint(0, max(ttl // 10, 1))
+        await redis_client.set(self.key(object_id), value.json(), ex=ttl)
+
+    async def invalidate(self, object_id: int) -> None:
+        await redis_client.delete(self.key(object_id))
+        if settings.DATABASE_REPLICA_URL:
+            # A reader on a lagging replica may refill the key with the old
+            # row; delete it once more after the replica has caught up.
+            task = asyncio.create_task(self._delayed_delete(self.key(object_id)))
+            delayed_delete_tasks.add(task)
+            task.add_done_callback(delayed_delete_tasks.discard)
+
+    async def _delayed_delete(self, key: str) -> None:
+        try:
+            await asyncio.sleep(settings.DB_REPLICA_STICKY_SECONDS)
+            await redis_client.delete(key)
+        except Exception:
+            logger.exception("Failed to delete cache key %s after replica lag", key)
+
+
+def primary_sticky_key(account_id: int) -> str:
+    return f"primary_sticky:{account_id}"
+
+
+async def mark_primary_sticky(account_id: int) -> None:
+    # 쓰기가 커밋된 뒤에 호출합니다. 이 사용자의 이후 읽기는 복제 지연을 보지 않도록
+    # DB_REPLICA_STICKY_SECONDS 동안 primary에서 합니다 (get_read_db).
+    if settings.DATABASE_REPLICA_URL:
+        await redis_client.set(
+            primary_sticky_key(account_id), 1, ex=settings.DB_REPLICA_STICKY_SECONDS
+        )
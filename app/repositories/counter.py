@@ -0,0 +1,134 @@
+import uuid
+from typing import Dict, Iterable
+
+from redis.exceptions import WatchError
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Board
+from app.db.redis import redis_client
+
+# Longer than any flush should take; a crashed flusher's lock expires
+FLUSH_LOCK_SECONDS = 60
+
+
+class PostCountBuffer:
+    """Buffers board post_count deltas in Redis instead of the board row.
+
+    Each board has an INCRBY counter of not-yet-flushed posts plus a
+    membership in a "dirty" set, and a background flusher periodically
+    folds the deltas into Board.post_count. Readers add the pending delta
+    to the stored value.
+    """
+
+    DIRTY_KEY = "post_count:dirty"
+    FLUSH_LOCK_KEY = "post_count:flush_lock"
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.POST_COUNT_MODE == "buffered"
+
+    @staticmethod
+    def key(board_id: int) -> str:
+        return f"post_count:delta:{board_id}"
+
+    async def add(self, board_id: int, amount: int) -> None:
+        # 시간 복잡도: O(1)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.incrby(self.key(board_id), amount)
+            pipe.sadd(self.DIRTY_KEY, board_id)
+            await pipe.execute()
+
+    async def pending(self, board_ids: Iterable[int]) -> Dict[int, int]:
+        # 시간 복잡도: O(k), k = 게시판 수
+        board_ids = list(board_ids)
+        if not board_ids:
+            return {}
+        values = await redis_client.mget([self.key(board_id) for board_id in board_ids])
+        return {
+            board_id: int(value)
+            for board_id, value in zip(board_ids, values)
+            if value is not None and int(value) != 0
+        }
+
+    async def pending_all(self) -> Dict[int, int]:
+        # 시간 복잡도: O(k), k = 마지막 flush 이후 변경된 게시판 수
+        board_ids = [
+            int(board_id) for board_id in await redis_client.smembers(self.DIRTY_KEY)
+        ]
+        return await self.pending(board_ids)
+
+    async def flush(self, db: AsyncSession) -> Dict[int, int]:
+        # 시간 복잡도: O(k)
+        # 증감분은 읽기만 하고 DB 커밋이 끝난 뒤에 적용한 만큼 DECRBY로 뺍니다.
+        # 커밋 전에 워커가 죽어도 증감분은 Redis에 남아 다음 flush가 다시 적용하고,
+        # 그동안 읽는 쪽도 DB 값 + 증감분으로 정확한 값을 봅니다.
+        token = uuid.uuid4().hex
+        locked = await redis_client.set(
+            self.FLUSH_LOCK_KEY, token, nx=True, ex=FLUSH_LOCK_SECONDS
+        )
+        if not locked:
+            # Another worker is flushing; applying the same deltas twice
+            # would double count them.
+            return {}
+        try:
+            board_ids = [
+                int(board_id)
+                for board_id in await redis_client.smembers(self.DIRTY_KEY)
+            ]
+            if not board_ids:
+                return {}
+            values = await redis_client.mget(
+                [self.key(board_id) for board_id in board_ids]
+            )
+            deltas = {
+                board_id: int(value)
+                for board_id, value in zip(board_ids, values)
+                if value is not None and int(value) != 0
+            }
+            if deltas:
+                try:
+                    await db.execute(
+                        update(Board)
+                        .where(Board.id == bindparam("board_id"))
+                        .values(post_count=Board.post_count + bindparam("delta"))
+                        .execution_options(synchronize_session=False),
+                        [
+                            {"board_id": board_id, "delta": delta}
+                            for board_id, delta in deltas.items()
+                        ],
+                    )
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+            for board_id in board_ids:
+                await self._settle(board_id, deltas.get(board_id, 0))
+            return deltas
+        finally:
+            if await redis_client.get(self.FLUSH_LOCK_KEY) == token.encode():
+                await redis_client.delete(self.FLUSH_LOCK_KEY)
+
+    async def _settle(self, board_id: int, applied: int) -> None:
+        # 커밋된 만큼 빼고, 남은 증감분이 없으면 카운터와 dirty 표시를 지웁니다.
+        key = self.key(board_id)
+        if applied:
+            await redis_client.decrby(key, applied)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.watch(key)
+            value = await pipe.get(key)
+            if value is not None and int(value) != 0:
+                await pipe.unwatch()
+                return
+            pipe.multi()
+            pipe.delete(key)
+            pipe.srem(self.DIRTY_KEY, board_id)
+            try:
+                await pipe.execute()
+            except WatchError:
+                # add() ran in between; the board stays dirty for next time
+                pass
+
+
+post_count_buffer = PostCountBuffer()
@@ -1,12 +1,53 @@
-from typing import List, Optional
+from collections import Counter
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import (
+    Integer,
+    String,
+    Text,
+    bindparam,
+    cast,
+    func,
+    insert,
+    literal_column,
+    or_,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db.models import Post
+from app.core.config import settings
+from app.db.models import Board, Post
 from app.repositories.board import BoardRepository
-from app.schemas.post import PostCreate, PostUpdate
+from app.repositories.cache import ReadThroughCache
+from app.repositories.search import post_search_index
+from app.schemas.post import PostCreate, PostOut, PostSummary, PostUpdate
+from app.utils.cursor import decode_cursor, encode_cursor
+
+post_cache = ReadThroughCache("post", PostOut)
+
+# 목록에서 읽는 컬럼
+POST_OUT_COLUMNS = tuple(getattr(Post, field) for field in PostOut.__fields__)
+# fields=summary 목록에서 읽는 컬럼. 본문 대신 DB에서 자른 excerpt를 함께 읽습니다.
+POST_SUMMARY_COLUMNS = tuple(
+    getattr(Post, field) for field in PostSummary.__fields__ if field != "excerpt"
+)
+
+# Postgres 전문 검색. search_vector는 마이그레이션(f1d8a6c3b590)이 만드는 생성 컬럼으로
+# 모델에는 매핑하지 않습니다. 설정 이름은 마이그레이션과 같아야 합니다.
+SEARCH_TEXT_CONFIG = "simple"
+search_vector = literal_column("post.search_vector", type_=TSVECTOR)
+
+
+# bulk_create_posts가 배열로 넘기는 컬럼과 Postgres 배열 원소 타입
+BATCH_INSERT_COLUMNS = (
+    ("board_id", Integer),
+    ("title", String),
+    ("content", Text),
+    ("owner_id", Integer),
+)
 
 
 class PostRepository:
@@ -20,18 +61,161 @@ class PostRepository:
             owner_id=user_id,
         )
         db.add(db_post)
+        # INSERT와 post_count 증가를 하나의 트랜잭션으로 커밋합니다.
+        await BoardRepository.increment_post_count(db, post.board_id)
         await db.commit()
-        await db.refresh(db_post)
+        await BoardRepository.post_count_changed(post.board_id, 1)
+        await post_search_index.post_changed(db_post)
+        return db_post
 
-        await BoardRepository.increment_post_count(db, post.board_id)
+    @staticmethod
+    async def bulk_create_posts(
+        db: AsyncSession, posts: List[PostCreate], user_id: int
+    ) -> List[PostOut]:
+        # 시간 복잡도: O(n)
+        # 게시물 INSERT와 게시판별 post_count 조정을 하나의 트랜잭션으로 커밋합니다.
+        # 게시판 권한 확인은 호출한 쪽의 몫입니다.
+        rows = [
+            {
+                "board_id": post.board_id,
+                "title": post.title,
+                "content": post.content,
+                "owner_id": user_id,
+            }
+            for post in posts
+        ]
+        created = []
+        if db.bind.dialect.full_returning:
+            # INSERT ... SELECT ... RETURNING을 청크마다 한 번 실행합니다.
+            chunk_size = settings.POST_BATCH_INSERT_CHUNK_SIZE
+            for start in range(0, len(rows), chunk_size):
+                result = await db.execute(
+                    PostRepository.ordered_insert(rows[start : start + chunk_size])
+                )
+                # RETURNING의 행 순서는 보장되지 않지만 id는 입력 순서대로 매겨지므로
+                # id로 정렬하면 요청 순서가 됩니다.
+                returned = sorted(result, key=lambda row: row.id)
+                created.extend(PostOut.parse_obj(row._mapping) for row in returned)
+        else:
+            # RETURNING이 없는 DB(SQLite)에서는 ORM flush로 id를 받습니다.
+            db_posts = [Post(**row) for row in rows]
+            db.add_all(db_posts)
+            await db.flush()
+            created = [PostOut.from_orm(db_post) for db_post in db_posts]
 
-        return db_post
+        amounts = Counter(post.board_id for post in posts)
+        await BoardRepository.increment_post_counts(db, amounts)
+        await db.commit()
+        for board_id, amount in amounts.items():
+            await BoardRepository.post_count_changed(board_id, amount)
+        for created_post in created:
+            await post_search_index.post_changed(created_post)
+        return created
+
+    @staticmethod
+    def ordered_insert(rows: List[dict]):
+        # 입력 행을 배열로 넘겨 unnest ... WITH ORDINALITY로 펼치고 ORDER BY ordinal로
+        # INSERT합니다. 이렇게 하면 Postgres가 id(시퀀스)를 입력 순서대로 매깁니다
+        # (SQLAlchemy 2.0의 sort_by_parameter_order와 같은 방식). 바인드 파라미터는
+        # 행 수와 관계없이 4개입니다.
+        source = (
+            func.unnest(
+                *(
+                    cast(bindparam(name, [row[name] for row in rows]), ARRAY(type_))
+                    for name, type_ in BATCH_INSERT_COLUMNS
+                )
+            )
+            .table_valued(
+                *(name for name, _ in BATCH_INSERT_COLUMNS), with_ordinality="ordinal"
+            )
+            .render_derived()
+        )
+        names = [name for name, _ in BATCH_INSERT_COLUMNS]
+        return (
+            insert(Post)
+            .from_select(
+                names,
+                select(*(source.c[name] for name in names)).order_by(source.c.ordinal),
+            )
+            .returning(*Post.__table__.c)
+        )
 
     @staticmethod
     async def get_post(db: AsyncSession, post_id: int) -> Post:
         # 시간 복잡도: O(1)
-        result = await db.execute(select(Post).filter(Post.id == post_id))
-        return result.scalars().first()
+        # 같은 세션에서 이미 불러온 게시물이면 쿼리 없이 identity map에서 반환합니다.
+        return await db.get(Post, post_id)
+
+    @staticmethod
+    async def get_post_with_board(db: AsyncSession, post_id: int):
+        # 시간 복잡도: O(1)
+        # 게시물과 게시판의 공개 여부/소유자를 한 번의 JOIN 쿼리로 가져옵니다.
+        result = await db.execute(
+            select(
+                Post,
+                Board.public.label("board_public"),
+                Board.owner_id.label("board_owner_id"),
+            )
+            .outerjoin(Board, Post.board_id == Board.id)
+            .filter(Post.id == post_id)
+        )
+        return result.first()
+
+    @staticmethod
+    async def get_posts_with_board(db: AsyncSession, post_ids: Iterable[int]) -> Dict:
+        # 시간 복잡도: O(k log n), k = 게시물 수
+        # get_post_with_board의 여러 건 버전입니다. IN 쿼리 한 번으로 가져옵니다.
+        post_ids = set(post_ids)
+        if not post_ids:
+            return {}
+        result = await db.execute(
+            select(
+                Post,
+                Board.public.label("board_public"),
+                Board.owner_id.label("board_owner_id"),
+            )
+            .outerjoin(Board, Post.board_id == Board.id)
+            .filter(Post.id.in_(post_ids))
+        )
+        return {row.Post.id: row for row in result}
+
+    @staticmethod
+    async def get_post_cached(db: AsyncSession, post_id: int) -> Optional[PostOut]:
+        # 시간 복잡도: O(1)
+        # 읽기 전용 경로에서 사용합니다. 수정이 필요한 경우 get_post를 사용하세요.
+        async def load():
+            db_post = await PostRepository.get_post(db, post_id)
+            return PostOut.from_orm(db_post) if db_post else None
+
+        return await post_cache.get(post_id, load)
+
+    @staticmethod
+    async def get_post_with_board_cached(
+        db: AsyncSession, post_id: int
+    ) -> Optional[Tuple[PostOut, Optional[bool], Optional[int]]]:
+        # 시간 복잡도: O(1)
+        # (게시물, 게시판 공개 여부, 게시판 소유자)를 반환합니다.
+        # 캐시 미스일 때는 JOIN 쿼리 한 번으로 게시판 권한 정보까지 가져옵니다.
+        loaded = {}
+
+        async def load():
+            row = await PostRepository.get_post_with_board(db, post_id)
+            if row is None:
+                return None
+            loaded["row"] = row
+            return PostOut.from_orm(row.Post)
+
+        post = await post_cache.get(post_id, load)
+        if post is None:
+            return None
+        if "row" in loaded:
+            row = loaded["row"]
+            return post, row.board_public, row.board_owner_id
+
+        board = await BoardRepository.get_board_cached(db, post.board_id)
+        if board is None:
+            return post, None, None
+        return post, board.public, board.owner_id
 
     @staticmethod
     async def update_post(db: AsyncSession, post: PostUpdate, post_id: int) -> Post:
@@ -42,6 +226,8 @@ class PostRepository:
             db_post.content = post.content
             await db.commit()
             await db.refresh(db_post)
+            await post_cache.invalidate(post_id)
+            await post_search_index.post_changed(db_post)
         return db_post
 
     @staticmethod
@@ -51,9 +237,26 @@ class PostRepository:
         if db_post:
             board_id = db_post.board_id
             await db.delete(db_post)
+            await BoardRepository.decrement_post_count(db, board_id)
             await db.commit()
+            await post_cache.invalidate(post_id)
+            await BoardRepository.post_count_changed(board_id, -1)
+            await post_search_index.post_removed(post_id)
 
-            await BoardRepository.decrement_post_count(db, board_id)
+    @staticmethod
+    async def stream_posts_by_board(
+        db: AsyncSession, board_id: int, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        # 시간 복잡도: O(n), 메모리: O(batch_size)
+        # 서버 측 커서로 읽고 batch_size 행씩 넘겨줍니다. ORM 객체를 만들지 않도록
+        # 컬럼만 선택하므로 identity map도 커지지 않습니다.
+        result = await db.stream(
+            select(Post.id, Post.board_id, Post.title, Post.content, Post.owner_id)
+            .filter(Post.board_id == board_id)
+            .order_by(Post.id)
+        )
+        async for rows in result.partitions(batch_size):
+            yield rows
 
     @staticmethod
     async def get_posts_by_board(
@@ -61,26 +264,106 @@ class PostRepository:
         board_id: int,
         limit: int = 10,
         cursor: Optional[int] = None,
-    ) -> (int, List[Post], Optional[int]):
+        include_total: bool = True,
+        summary: bool = False,
+    ) -> (Optional[int], List[dict], Optional[int]):
         # 시간 복잡도: O(n) 또는 O(log n) (커서를 사용하는 경우)
         # 커서를 사용하지 않는 경우, 전체 결과 집합을 가져오므로 O(n)
         # 커서를 사용하는 경우, 인덱스를 사용하여 부분 결과 집합을 가져오므로 O(log n)
-        base_query = select(Post).filter(Post.board_id == board_id)
+        # ORM 객체 대신 PostOut 필드만 담은 dict를 반환합니다.
+        # summary이면 content 대신 앞부분만 잘라 excerpt로 반환합니다(PostSummary).
+        columns = POST_OUT_COLUMNS
+        if summary:
+            excerpt = func.substr(Post.content, 1, settings.POST_EXCERPT_LENGTH)
+            columns = (*POST_SUMMARY_COLUMNS, excerpt.label("excerpt"))
+        base_query = select(*columns).filter(Post.board_id == board_id)
         if cursor:
             base_query = base_query.filter(Post.id > cursor)
 
-        total_query = select(func.count(Post.id)).filter(Post.board_id == board_id)
-        total_result = await db.execute(total_query)
-        total = total_result.scalar()
+        # COUNT(*) 대신 게시판에 유지되는 post_count를 사용합니다.
+        total = None
+        if include_total:
+            board = await BoardRepository.get_board_cached(db, board_id)
+            total = board.post_count if board else 0
 
         query = base_query.order_by(Post.id).limit(limit + 1)
         result = await db.execute(query)
-        posts = result.scalars().all()
+        posts = [dict(row._mapping) for row in result]
 
         if len(posts) > limit:
-            next_cursor = posts[-2].id
+            next_cursor = posts[-2]["id"]
             posts = posts[:-1]
         else:
             next_cursor = None
 
         return total, posts, next_cursor
+
+    @staticmethod
+    async def search_posts(
+        db: AsyncSession,
+        query: str,
+        user_id: int,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> (List[Post], Optional[str]):
+        # 시간 복잡도: O(log n + m), m = 검색어와 일치하는 게시물 수 (GIN 인덱스 조회 후 순위 계산)
+        # 커서는 (rank, id)이며 둘 다 내림차순입니다.
+        ts_query = func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, query)
+        rank = func.ts_rank(search_vector, ts_query)
+        statement = (
+            select(Post, rank.label("rank"))
+            .join(Board, Post.board_id == Board.id)
+            .filter(search_vector.op("@@")(ts_query))
+            # list_posts_service와 같은 규칙: 공개 게시판이거나 내 게시판
+            .filter(or_(Board.public == True, Board.owner_id == user_id))
+        )
+        after = decode_cursor(cursor, (float, int))
+        if after:
+            statement = statement.filter(tuple_(rank, Post.id) < tuple_(*after))
+        result = await db.execute(
+            statement.order_by(rank.desc(), Post.id.desc()).limit(limit + 1)
+        )
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].Post.id)
+        return [row.Post for row in rows], next_cursor
+
+    @staticmethod
+    async def search_posts_in_memory(
+        db: AsyncSession,
+        query: str,
+        user_id: int,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> (List[Post], Optional[str]):
+        # 시간 복잡도: O(m log m + limit), m = 검색어와 일치하는 게시물 수
+        # search_posts와 같은 결과 형식과 (score, id) 커서를 사용합니다.
+        # 순위는 인덱스가 매기고, DB는 후보 게시물과 게시판 권한만 IN 쿼리로 읽습니다.
+        results = post_search_index.search(query, decode_cursor(cursor, (float, int)))
+        posts, scores = [], []
+        batch_size = max(limit * 2, 20)
+        for start in range(0, len(results), batch_size):
+            batch = results[start : start + batch_size]
+            rows = await PostRepository.get_posts_with_board(
+                db, (post_id for _, post_id in batch)
+            )
+            for score, post_id in batch:
+                row = rows.get(post_id)
+                # 인덱스가 아직 삭제를 반영하지 못했거나 볼 수 없는 게시판이면 건너뜁니다.
+                if row is None or row.board_public is None:
+                    continue
+                if not row.board_public and row.board_owner_id != user_id:
+                    continue
+                posts.append(row.Post)
+                scores.append(score)
+            if len(posts) > limit:
+                break
+
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(scores[limit - 1], posts[-1].id)
+        return posts, next_cursor
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.db.models import Post
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal
+from app.utils.search_index import InvertedIndex, tokenize
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_CHANNEL = "search:index"
+# 제목의 단어는 본문보다 이만큼 더 중요하게 칩니다 (search_vector의 A/B 가중치 대신).
+TITLE_WEIGHT = 2
+REBUILD_BATCH_SIZE = 1000
+
+
+def post_tokens(title: str, content: str) -> List[str]:
+    return tokenize(title) * TITLE_WEIGHT + tokenize(content)
+
+
+class PostSearchIndex:
+    """Per-worker BM25 index of posts used when SEARCH_BACKEND is "memory".
+
+    listen() builds the index from the post table and then applies the
+    changes the post repository publishes on Redis, so every worker keeps
+    its own copy current.
+    """
+
+    def __init__(self):
+        self.index = InvertedIndex()
+        # Changes that arrive while rebuild() is reading the table
+        self._replay: Optional[list] = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.SEARCH_BACKEND == "memory"
+
+    def apply(self, change: dict) -> None:
+        # 시간 복잡도: O(t·p)
+        if change["op"] == "upsert":
+            self.index.add(
+                change["id"], post_tokens(change["title"], change["content"])
+            )
+        else:
+            self.index.remove(change["id"])
+        if self._replay is not None:
+            self._replay.append(change)
+
+    async def post_changed(self, post) -> None:
+        # 게시물 생성/수정이 커밋된 후에 호출합니다.
+        if self.enabled():
+            await self._publish(
+                {
+                    "op": "upsert",
+                    "id": post.id,
+                    "title": post.title,
+                    "content": post.content,
+                }
+            )
+
+    async def post_removed(self, post_id: int) -> None:
+        # 게시물 삭제가 커밋된 후에 호출합니다.
+        if self.enabled():
+            await self._publish({"op": "remove", "id": post_id})
+
+    async def _publish(self, change: dict) -> None:
+        # Apply locally right away so this worker reads its own writes; the
+        # echo from the channel is idempotent.
+        self.apply(change)
+        await redis_client.publish(SEARCH_INDEX_CHANNEL, json.dumps(change))
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        # 시간 복잡도: O(n) (전체 게시물)
+        index = InvertedIndex()
+        self._replay = []
+        try:
+            result = await db.stream(select(Post.id, Post.title, Post.content))
+            async for rows in result.partitions(REBUILD_BATCH_SIZE):
+                for row in rows:
+                    index.add(row.id, post_tokens(row.title, row.content))
+            self.index, replay = index, self._replay
+        finally:
+            self._replay = None
+        for change in replay:
+            self.apply(change)
+        logger.info("Search index rebuilt with %d posts", len(self.index))
+
+    def search(
+        self, query: str, after: Optional[Tuple[float, int]] = None
+    ) -> List[Tuple[float, int]]:
+        # 시간 복잡도: O(s·q log p + m log m)
+        # (score, post_id) 내림차순. after가 주어지면 그 뒤의 결과만 반환합니다.
+        # BM25 점수는 문서 수, 평균 길이, idf에 따라 달라지므로 페이지 사이에 게시물이
+        # 추가/삭제되면 커서 앞뒤로 결과가 빠지거나 중복될 수 있습니다.
+        results = self.index.search(tokenize(query))
+        if after is not None:
+            results = [result for result in results if result < tuple(after)]
+        return results
+
+    async def listen(self) -> None:
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(SEARCH_INDEX_CHANNEL)
+                # Changes published while we were not subscribed are lost, so
+                # (re)build from the table once the subscription is live.
+                # Messages arriving meanwhile queue up and are applied after.
+                async with AsyncSessionLocal() as db:
+                    await self.rebuild(db)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.apply(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Search index listener failed, retrying")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+
+post_search_index = PostSearchIndex()
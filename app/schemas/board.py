@@ -26,5 +26,15 @@ class BoardUpdate(BaseModel):
 
 class BoardList(BaseModel):
     boards: List[BoardOut]
-    total: int
-    next_cursor: Optional[int] = None
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class BoardBatchGetItem(BaseModel):
+    id: int
+    status: str  # "ok", "not_found" or "forbidden"
+    board: Optional[BoardOut] = None
+
+
+class BoardBatchGet(BaseModel):
+    items: List[BoardBatchGetItem]  # in request order
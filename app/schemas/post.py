@@ -27,5 +27,53 @@ class PostOut(BaseModel):
 
 class PostList(BaseModel):
     posts: List[PostOut]
-    total: int
+    total: Optional[int] = None
     next_cursor: Optional[int] = None
+
+
+class PostSummary(BaseModel):
+    id: int
+    board_id: int
+    title: str
+    owner_id: int
+    excerpt: str  # first POST_EXCERPT_LENGTH characters of content
+
+    class Config:
+        orm_mode = True
+
+
+class PostSummaryList(BaseModel):
+    posts: List[PostSummary]
+    total: Optional[int] = None
+    next_cursor: Optional[int] = None
+
+
+class PostBatchCreate(BaseModel):
+    posts: List[PostCreate]
+
+
+class PostBatchError(BaseModel):
+    index: int  # position in PostBatchCreate.posts
+    board_id: int
+    error: str
+    code: int
+
+
+class PostBatchResult(BaseModel):
+    created: List[PostOut]  # in request order
+    errors: List[PostBatchError]
+
+
+class PostBatchGetItem(BaseModel):
+    id: int
+    status: str  # "ok", "not_found" or "forbidden"
+    post: Optional[PostOut] = None
+
+
+class PostBatchGet(BaseModel):
+    items: List[PostBatchGetItem]  # in request order
+
+
+class PostSearchResult(BaseModel):
+    posts: List[PostOut]  # best match first
+    next_cursor: Optional[str] = None
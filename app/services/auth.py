@@ -1,27 +1,151 @@
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
 from datetime import timedelta
+from typing import Optional
 
-import redis.asyncio as redis
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_and_update_password_async
+from app.db.models import Account
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal
 from app.repositories.account import AccountRepository
-from app.utils.exceptions import raise_unauthorized
+from app.utils.cache import LRUCache
+from app.utils.exceptions import raise_too_many_requests, raise_unauthorized
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/login")
 
-# Redis 클라이언트 초기화
-redis_client = redis.from_url(settings.REDIS_URL)
+# 검증이 끝난 토큰 -> 계정 스냅샷 (워커별 캐시)
+SESSION_INVALIDATION_CHANNEL = "session:invalidate"
+token_cache = LRUCache(settings.TOKEN_CACHE_MAX_SIZE)
+# 토큰 캐시에서 계정을 무효화할 때마다 증가합니다. 세션 확인 전에 읽은 값과 다르면
+# 그 사이에 로그아웃이 있었을 수 있으므로 캐시하지 않습니다.
+token_cache_generation = 0
+
+# 이 워커에서 진행 중인 로그인 검증 수
+login_verifications_in_flight = 0
 
+# 응답을 막지 않도록 백그라운드에서 실행 중인 비밀번호 재해시 작업
+rehash_tasks: set[asyncio.Task] = set()
 
-async def authenticate_account(db: AsyncSession, email: str, password: str):
-    account = await AccountRepository.get_by_email(db, email)
-    if not account or not verify_password(password, account.hashed_password):
+
+async def authenticate_account(
+    db: AsyncSession, email: str, password: str, client_ip: Optional[str] = None
+):
+    # 비밀번호 검증(bcrypt) 전에 요청 횟수와 동시 검증 수를 먼저 확인합니다.
+    attempt = await check_login_rate_limit(email, client_ip)
+    try:
+        async with login_verification_slot():
+            account = await AccountRepository.get_by_email(db, email)
+            verified, new_hash = False, None
+            if account:
+                verified, new_hash = await verify_and_update_password_async(
+                    password, account.hashed_password
+                )
+    except BaseException:
+        # The check never ran (slot or hasher full, cancelled), so it is not
+        # a failure
+        await redis_client.zrem(login_failures_key(email), attempt)
+        raise
+    if not verified:
+        # 예약해 둔 시도가 그대로 실패로 남습니다.
         raise_unauthorized("Incorrect email or password", code=4012)
+    # 이 시도의 예약만 지웁니다. 키 전체를 지우면 동시에 검증 중인 다른 시도의
+    # 예약까지 사라집니다.
+    await redis_client.zrem(login_failures_key(email), attempt)
+    if new_hash:
+        schedule_password_rehash(account.id, new_hash)
     return account
 
 
+def schedule_password_rehash(account_id: int, new_hash: str):
+    # The stored hash was made under an older scheme or cost; replace it
+    # without making the login wait for the write.
+    task = asyncio.create_task(rehash_password(account_id, new_hash))
+    rehash_tasks.add(task)
+    task.add_done_callback(rehash_tasks.discard)
+
+
+async def rehash_password(account_id: int, new_hash: str):
+    try:
+        async with AsyncSessionLocal() as db:
+            await AccountRepository.update_password_hash(db, account_id, new_hash)
+    except Exception:
+        logger.exception("Failed to upgrade password hash for account %s", account_id)
+
+
+def login_failures_key(email: str) -> str:
+    return f"login_failures:email:{email.lower()}"
+
+
+async def sliding_window_add(key: str, window: int, member: str) -> int:
+    # 시간 복잡도: O(log n)
+    # Sorted set of attempt timestamps; entries older than the window fall
+    # off. The attempt is added and counted in one transaction, so
+    # concurrent attempts each see the others.
+    now = time.time()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(key, 0, now - window)
+        pipe.zadd(key, {member: now})
+        pipe.expire(key, window)
+        pipe.zcard(key)
+        results = await pipe.execute()
+    return results[-1]
+
+
+async def check_login_rate_limit(email: str, client_ip: Optional[str]) -> str:
+    # Every attempt from an IP counts. Per email, an attempt is reserved as a
+    # failure before the password check and removed again on success, so
+    # successful logins never count and parallel guesses cannot all pass the
+    # check before any of them fails.
+    # Returns the reservation for authenticate_account.
+    if client_ip:
+        attempts = await sliding_window_add(
+            f"login_attempts:ip:{client_ip}",
+            settings.LOGIN_IP_WINDOW_SECONDS,
+            uuid.uuid4().hex,
+        )
+        if attempts > settings.LOGIN_ATTEMPTS_PER_IP:
+            raise_too_many_requests(
+                "Too many login attempts",
+                code=4291,
+                retry_after=settings.LOGIN_IP_WINDOW_SECONDS,
+            )
+
+    key = login_failures_key(email)
+    attempt = uuid.uuid4().hex
+    failures = await sliding_window_add(
+        key, settings.LOGIN_EMAIL_WINDOW_SECONDS, attempt
+    )
+    if failures > settings.LOGIN_FAILURES_PER_EMAIL:
+        await redis_client.zrem(key, attempt)
+        raise_too_many_requests(
+            "Too many failed login attempts for this account",
+            code=4292,
+            retry_after=settings.LOGIN_EMAIL_WINDOW_SECONDS,
+        )
+    return attempt
+
+
+@asynccontextmanager
+async def login_verification_slot():
+    global login_verifications_in_flight
+    if login_verifications_in_flight >= settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS:
+        raise_too_many_requests("Too many concurrent login attempts", code=4293)
+    login_verifications_in_flight += 1
+    try:
+        yield
+    finally:
+        login_verifications_in_flight -= 1
+
+
 async def create_session(account_id: int):
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -37,3 +161,60 @@ async def create_session(account_id: int):
 
 async def destroy_session(account_id: int):
     await redis_client.delete(f"session:{account_id}")
+    evict_cached_account(account_id)
+    # Let the other workers drop their cached copies of this account's tokens
+    await redis_client.publish(SESSION_INVALIDATION_CHANNEL, account_id)
+
+
+def get_cached_account(token: str):
+    # 시간 복잡도: O(1)
+    return token_cache.get(token)
+
+
+def session_generation() -> int:
+    # 세션을 확인하기 전에 읽어 두었다가 cache_verified_token에 넘깁니다.
+    return token_cache_generation
+
+
+def cache_verified_token(
+    token: str, account: Account, expires_at: int, generation: int
+):
+    # A session destroyed while this request was being verified must not be
+    # cached again after its eviction.
+    if generation != token_cache_generation:
+        return
+    # Never keep a token around longer than the token itself is valid
+    ttl = min(settings.TOKEN_CACHE_TTL_SECONDS, expires_at - time.time())
+    token_cache.set(token, account, ttl)
+
+
+def evict_cached_account(account_id: int):
+    global token_cache_generation
+    token_cache_generation += 1
+    token_cache.delete_where(lambda account: account.id == account_id)
+
+
+def clear_token_cache():
+    global token_cache_generation
+    token_cache_generation += 1
+    token_cache.clear()
+
+
+async def listen_session_invalidations():
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(SESSION_INVALIDATION_CHANNEL)
+            # Invalidations published while we were not subscribed are lost,
+            # so start from an empty cache on every (re)subscribe.
+            clear_token_cache()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    evict_cached_account(int(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Session invalidation listener failed, retrying")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.close()
@@ -1,18 +1,29 @@
-from typing import Optional
+import asyncio
+import logging
+from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, release_connection
 from app.repositories.board import BoardRepository
+from app.repositories.cache import mark_primary_sticky
 from app.schemas.board import BoardCreate, BoardUpdate
 from app.utils.exceptions import raise_forbidden, raise_not_found
 
+logger = logging.getLogger(__name__)
+
 
 async def create_board_service(board: BoardCreate, user_id: int, db: AsyncSession):
-    return await BoardRepository.create_board(db, board, user_id)
+    db_board = await BoardRepository.create_board(db, board, user_id)
+    await release_connection(db)
+    await mark_primary_sticky(user_id)
+    return db_board
 
 
 async def get_board_service(board_id: int, user_id: int, db: AsyncSession):
-    db_board = await BoardRepository.get_board(db, board_id)
+    db_board = await BoardRepository.get_board_cached(db, board_id)
+    await release_connection(db)
     if not db_board:
         raise_not_found("Board not found", code=4044)
     if not db_board.public and db_board.owner_id != user_id:
@@ -20,6 +31,23 @@ async def get_board_service(board_id: int, user_id: int, db: AsyncSession):
     return db_board
 
 
+async def get_boards_by_ids_service(
+    board_ids: List[int], user_id: int, db: AsyncSession
+):
+    boards = await BoardRepository.get_boards_by_ids(db, board_ids)
+    await release_connection(db)
+    items = []
+    for board_id in board_ids:
+        board = boards.get(board_id)
+        if board is None:
+            items.append({"id": board_id, "status": "not_found"})
+        elif not board.public and board.owner_id != user_id:
+            items.append({"id": board_id, "status": "forbidden"})
+        else:
+            items.append({"id": board_id, "status": "ok", "board": board})
+    return {"items": items}
+
+
 async def update_board_service(
     board_id: int, board: BoardUpdate, user_id: int, db: AsyncSession
 ):
@@ -28,7 +56,10 @@ async def update_board_service(
         raise_not_found("Board not found", code=4044)
     if db_board.owner_id != user_id:
         raise_forbidden("You do not have permission to update this board", code=4033)
-    return await BoardRepository.update_board(db, board, board_id, user_id)
+    db_board = await BoardRepository.update_board(db, board, board_id, user_id)
+    await release_connection(db)
+    await mark_primary_sticky(user_id)
+    return db_board
 
 
 async def delete_board_service(board_id: int, user_id: int, db: AsyncSession):
@@ -38,17 +69,37 @@ async def delete_board_service(board_id: int, user_id: int, db: AsyncSession):
     if db_board.owner_id != user_id:
         raise_forbidden("You do not have permission to delete this board", code=4034)
     await BoardRepository.delete_board(db, board_id, user_id)
+    await release_connection(db)
+    await mark_primary_sticky(user_id)
 
 
 async def list_boards_service(
     user_id: int,
     limit: int,
-    cursor: Optional[int],
+    cursor: Optional[str],
     offset: int,
     db: AsyncSession,
     order_by_post_count: bool,
+    include_total: bool = True,
 ):
     total, boards, next_cursor = await BoardRepository.get_boards(
-        db, user_id, limit, cursor, offset, order_by_post_count
+        db, user_id, limit, cursor, offset, order_by_post_count, include_total
     )
+    await release_connection(db)
     return total, boards, next_cursor
+
+
+async def flush_post_counts_service():
+    async with AsyncSessionLocal() as db:
+        return await BoardRepository.flush_post_counts(db)
+
+
+async def run_post_count_flusher():
+    while True:
+        await asyncio.sleep(settings.POST_COUNT_FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_post_counts_service()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to flush buffered post counts")
@@ -1,34 +1,110 @@
-from typing import Optional
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.db.session import release_connection
 from app.repositories.board import BoardRepository
+from app.repositories.cache import mark_primary_sticky
 from app.repositories.post import PostRepository
-from app.schemas.post import PostCreate, PostUpdate
-from app.utils.exceptions import raise_forbidden, raise_not_found
+from app.schemas.post import PostBatchCreate, PostBatchError, PostCreate, PostUpdate
+from app.utils.exceptions import (
+    raise_bad_request,
+    raise_forbidden,
+    raise_not_found,
+    raise_service_unavailable,
+)
 
 
 async def create_post_service(post: PostCreate, user_id: int, db: AsyncSession):
+    # 쓰기 경로의 권한 확인은 캐시가 아닌 DB의 현재 값으로 합니다.
     board = await BoardRepository.get_board(db, post.board_id)
     if not board:
         raise_not_found("Board not found", code=4044)
     if not board.public and board.owner_id != user_id:
         raise_forbidden("You cannot create a post in this board", code=4032)
-    return await PostRepository.create_post(db, post, user_id)
+    db_post = await PostRepository.create_post(db, post, user_id)
+    await release_connection(db)
+    await mark_primary_sticky(user_id)
+    return db_post
+
+
+async def bulk_create_posts_service(
+    batch: PostBatchCreate, user_id: int, db: AsyncSession
+):
+    if len(batch.posts) > settings.POST_BATCH_MAX_SIZE:
+        raise_bad_request(
+            f"A batch may contain at most {settings.POST_BATCH_MAX_SIZE} posts",
+            code=4004,
+        )
+    # 게시판마다 한 번씩만, IN 쿼리 한 번으로 권한을 확인합니다.
+    boards = await BoardRepository.get_boards_by_ids(
+        db, (post.board_id for post in batch.posts)
+    )
+    valid, errors = [], []
+    for index, post in enumerate(batch.posts):
+        board = boards.get(post.board_id)
+        if board is None:
+            errors.append(
+                PostBatchError(
+                    index=index,
+                    board_id=post.board_id,
+                    error="Board not found",
+                    code=4044,
+                )
+            )
+        elif not board.public and board.owner_id != user_id:
+            errors.append(
+                PostBatchError(
+                    index=index,
+                    board_id=post.board_id,
+                    error="You cannot create a post in this board",
+                    code=4032,
+                )
+            )
+        else:
+            valid.append(post)
+
+    created = []
+    if valid:
+        created = await PostRepository.bulk_create_posts(db, valid, user_id)
+        await mark_primary_sticky(user_id)
+    await release_connection(db)
+    return {"created": created, "errors": errors}
 
 
 async def get_post_service(post_id: int, user_id: int, db: AsyncSession):
-    db_post = await PostRepository.get_post(db, post_id)
-    if not db_post:
+    row = await PostRepository.get_post_with_board_cached(db, post_id)
+    await release_connection(db)
+    if not row:
         raise_not_found("Post not found", code=4045)
-    board = await BoardRepository.get_board(db, db_post.board_id)
-    if not board:
+    db_post, board_public, board_owner_id = row
+    if board_public is None:
         raise_not_found("Board not found", code=4044)
-    if not board.public and board.owner_id != user_id:
+    if not board_public and board_owner_id != user_id:
         raise_forbidden("You do not have permission to access this post", code=4033)
     return db_post
 
 
+async def get_posts_by_ids_service(post_ids: List[int], user_id: int, db: AsyncSession):
+    rows = await PostRepository.get_posts_with_board(db, post_ids)
+    await release_connection(db)
+    items = []
+    for post_id in post_ids:
+        row = rows.get(post_id)
+        # get_post_service와 같은 규칙: 게시판이 없으면 not_found
+        if row is None or row.board_public is None:
+            items.append({"id": post_id, "status": "not_found"})
+        elif not row.board_public and row.board_owner_id != user_id:
+            items.append({"id": post_id, "status": "forbidden"})
+        else:
+            items.append({"id": post_id, "status": "ok", "post": row.Post})
+    return {"items": items}
+
+
 async def update_post_service(
     post_id: int, post: PostUpdate, user_id: int, db: AsyncSession
 ):
@@ -37,7 +113,10 @@ async def update_post_service(
         raise_not_found("Post not found", code=4045)
     if db_post.owner_id != user_id:
         raise_forbidden("You do not have permission to update this post", code=4034)
-    return await PostRepository.update_post(db, post, post_id)
+    db_post = await PostRepository.update_post(db, post, post_id)
+    await release_connection(db)
+    await mark_primary_sticky(user_id)
+    return db_post
 
 
 async def delete_post_service(post_id: int, user_id: int, db: AsyncSession):
@@ -47,17 +126,86 @@ async def delete_post_service(post_id: int, user_id: int, db: AsyncSession):
     if db_post.owner_id != user_id:
         raise_forbidden("You do not have permission to delete this post", code=4035)
     await PostRepository.delete_post(db, post_id)
+    await release_connection(db)
+    await mark_primary_sticky(user_id)
 
 
 async def list_posts_service(
-    board_id: int, user_id: int, limit: int, cursor: Optional[int], db: AsyncSession
+    board_id: int,
+    user_id: int,
+    limit: int,
+    cursor: Optional[int],
+    db: AsyncSession,
+    include_total: bool = True,
+    summary: bool = False,
 ):
-    board = await BoardRepository.get_board(db, board_id)
+    board = await BoardRepository.get_board_cached(db, board_id)
     if not board:
         raise_not_found("Board not found", code=4044)
     if not board.public and board.owner_id != user_id:
         raise_forbidden("You do not have permission to access this board", code=4036)
-    total, posts, next_cursor = await PostRepository.get_posts_by_board(
-        db, board_id, limit, cursor
+    # 이미 불러온 게시판의 post_count를 total로 사용합니다.
+    _, posts, next_cursor = await PostRepository.get_posts_by_board(
+        db, board_id, limit, cursor, include_total=False, summary=summary
     )
+    await release_connection(db)
+    total = board.post_count if include_total else None
     return total, posts, next_cursor
+
+
+async def search_posts_service(
+    query: str, user_id: int, limit: int, cursor: Optional[str], db: AsyncSession
+):
+    if settings.SEARCH_BACKEND == "memory":
+        posts, next_cursor = await PostRepository.search_posts_in_memory(
+            db, query, user_id, limit, cursor
+        )
+    else:
+        if db.bind.dialect.name != "postgresql":
+            raise_service_unavailable(
+                "Full-text search is not available on this database", code=5032
+            )
+        posts, next_cursor = await PostRepository.search_posts(
+            db, query, user_id, limit, cursor
+        )
+    await release_connection(db)
+    return posts, next_cursor
+
+
+EXPORT_COLUMNS = ("id", "board_id", "title", "content", "owner_id")
+
+
+async def export_posts_service(
+    board_id: int, user_id: int, export_format: str, db: AsyncSession
+) -> AsyncIterator[str]:
+    # list_posts_service와 같은 권한 확인
+    board = await BoardRepository.get_board_cached(db, board_id)
+    await release_connection(db)
+    if not board:
+        raise_not_found("Board not found", code=4044)
+    if not board.public and board.owner_id != user_id:
+        raise_forbidden("You do not have permission to access this board", code=4036)
+
+    async def generate():
+        # get_db의 정리 단계는 스트리밍 응답이 끝난 뒤에 실행되므로 요청 세션을 그대로 씁니다.
+        if export_format == "csv":
+            yield _csv_lines([EXPORT_COLUMNS])
+        async for rows in PostRepository.stream_posts_by_board(
+            db, board_id, settings.EXPORT_BATCH_SIZE
+        ):
+            if export_format == "csv":
+                yield _csv_lines(rows)
+            else:
+                yield "".join(
+                    json.dumps(dict(row._mapping), ensure_ascii=False) + "\n"
+                    for row in rows
+                )
+        await release_connection(db)
+
+    return generate()
+
+
+def _csv_lines(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
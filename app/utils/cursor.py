@@ -0,0 +1,39 @@
+import base64
+import json
+import math
+from typing import Optional, Tuple
+
+from app.utils.exceptions import raise_bad_request
+
+
+def encode_cursor(*values) -> str:
+    # 클라이언트에는 불투명한 문자열로 전달합니다.
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], types: Tuple[type, ...]) -> Optional[tuple]:
+    # types는 커서 값마다 기대하는 타입입니다. 예: (int, int), (float, int)
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(map(_is_cursor_value, values, types))
+    ):
+        raise_bad_request("Invalid cursor", code=4003)
+    return tuple(values)
+
+
+def _is_cursor_value(value, expected: type) -> bool:
+    # bool은 int의 하위 클래스이므로 따로 거부합니다. float 자리에는 int도 허용합니다.
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float)) and math.isfinite(value)
+    return isinstance(value, expected)
@@ -19,3 +19,15 @@ def raise_unauthorized(detail: str, code: int = 4011):
         detail={"error": detail, "code": code},
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def raise_too_many_requests(detail: str, code: int = 4291, retry_after: int = 1):
+    raise HTTPException(
+        status_code=429,
+        detail={"error": detail, "code": code},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def raise_service_unavailable(detail: str, code: int = 5031):
+    raise HTTPException(status_code=503, detail={"error": detail, "code": code})
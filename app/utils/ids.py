@@ -0,0 +1,16 @@
+from typing import List
+
+from app.utils.exceptions import raise_bad_request
+
+
+def parse_ids(value: str, max_ids: int) -> List[int]:
+    # "1,2,3" 형식의 id 목록. 요청 순서를 유지합니다.
+    try:
+        ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        ids = None
+    if not ids:
+        raise_bad_request("ids must be a comma-separated list of integers", code=4005)
+    if len(ids) > max_ids:
+        raise_bad_request(f"At most {max_ids} ids may be requested", code=4005)
+    return ids
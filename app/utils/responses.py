@@ -0,0 +1,20 @@
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # poetry install -E orjson
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed.
+
+    Returning it from a handler skips response_model validation and
+    jsonable_encoder, so only use it for content made of plain dicts, lists,
+    str, int, float, bool and None that the server built itself.
+    """
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
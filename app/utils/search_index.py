@@ -0,0 +1,108 @@
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    # Postgres의 'simple' 설정과 비슷하게 소문자화만 하고 어간 추출은 하지 않습니다.
+    return TOKEN_RE.findall(unicodedata.normalize("NFKC", text or "").lower())
+
+
+class InvertedIndex:
+    """In-process inverted index over integer document ids, scored with BM25.
+
+    Each posting list keeps doc ids and term frequencies in two parallel
+    typed arrays sorted by doc id (8 bytes per posting) rather than lists
+    of Python ints.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._doc_lengths
+
+    def add(self, doc_id: int, tokens: Iterable[str]) -> None:
+        # 시간 복잡도: O(t·p), t = 문서의 고유 단어 수, p = 포스팅 리스트 길이
+        # (위치는 이분 탐색으로 찾지만 array.insert가 뒤쪽 원소를 옮깁니다)
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+        counts = Counter(tokens)
+        for term, frequency in counts.items():
+            doc_ids, frequencies = self._postings.setdefault(
+                term, (array("i"), array("I"))
+            )
+            position = bisect_left(doc_ids, doc_id)
+            doc_ids.insert(position, doc_id)
+            frequencies.insert(position, frequency)
+        length = sum(counts.values())
+        self._doc_terms[doc_id] = tuple(counts)
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int) -> None:
+        # 시간 복잡도: O(t·p) (del array[i]도 뒤쪽 원소를 옮깁니다)
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            doc_ids, frequencies = self._postings[term]
+            position = bisect_left(doc_ids, doc_id)
+            del doc_ids[position]
+            del frequencies[position]
+            if not doc_ids:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def search(self, tokens: Iterable[str]) -> List[Tuple[float, int]]:
+        # 시간 복잡도: O(s·q log p + m log m), s = 가장 짧은 포스팅 리스트, m = 결과 수
+        # 모든 단어를 포함하는 문서만 (score, doc_id) 내림차순으로 반환합니다.
+        terms = set(tokens)
+        if not terms or not self._doc_lengths:
+            return []
+        postings = [self._postings.get(term) for term in terms]
+        if any(posting is None for posting in postings):
+            return []
+        postings.sort(key=lambda posting: len(posting[0]))
+
+        doc_count = len(self._doc_lengths)
+        average_length = self._total_length / doc_count
+        idfs = [
+            math.log(1 + (doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            for doc_ids, _ in postings
+        ]
+
+        results = []
+        shortest_ids, shortest_frequencies = postings[0]
+        for doc_id, frequency in zip(shortest_ids, shortest_frequencies):
+            frequencies = [frequency]
+            for doc_ids, term_frequencies in postings[1:]:
+                position = bisect_left(doc_ids, doc_id)
+                if position == len(doc_ids) or doc_ids[position] != doc_id:
+                    break
+                frequencies.append(term_frequencies[position])
+            else:
+                norm = self.k1 * (
+                    1 - self.b + self.b * self._doc_lengths[doc_id] / average_length
+                )
+                score = sum(
+                    idf * tf * (self.k1 + 1) / (tf + norm)
+                    for idf, tf in zip(idfs, frequencies)
+                )
+                results.append((score, doc_id))
+        results.sort(reverse=True)
+        return results
@@ -1,8 +1,20 @@
 #!/bin/sh
 
-# 데이터베이스 마이그레이션 리비전 생성 및 적용
-alembic revision --autogenerate -m "initial migration"
-alembic upgrade head
+# 데이터베이스 마이그레이션 적용
+# MIGRATION_MODE=upgrade (기본값): 저장소에 포함된 마이그레이션만 적용합니다.
+# MIGRATION_MODE=skip: 마이그레이션을 건너뜁니다. (다른 컨테이너/잡이 이미 적용한 경우)
+# MIGRATION_MODE=autogenerate: 개발용. 리비전을 자동 생성한 뒤 적용합니다.
+case "${MIGRATION_MODE:-upgrade}" in
+  skip)
+    ;;
+  autogenerate)
+    alembic revision --autogenerate -m "auto migration"
+    alembic upgrade head
+    ;;
+  *)
+    alembic upgrade head
+    ;;
+esac
 
 # 애플리케이션 시작
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,412 @@
+"""Seed the database and measure API latency under mixed workloads.
+
+The target is the ASGI app in-process (default), a uvicorn server started
+by this script (--workers N), or a server that is already running (--url).
+Results are printed as JSON. Save one file per commit and compare with
+--baseline:
+
+    python -m scripts.bench_api --fake-backends --output before.json
+    python -m scripts.bench_api --fake-backends --baseline before.json
+    python -m scripts.bench_api --workers 4 --concurrency 64
+
+--fake-backends uses SQLite and fakeredis in-process, so no Postgres or
+Redis is needed. Otherwise the script uses the application's environment
+(.env). It seeds that database, which must be the one the target server
+uses, and leaves the rows behind under a "bench-<run id>" prefix.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+WORKLOADS = ("login", "posts_deep", "boards_by_post_count", "create_posts")
+PASSWORD = "benchmark-password"
+# Every request comes from one client address; keep the per-IP login limit
+# from turning the login storm into a 429 benchmark.
+BENCH_ENV = {"LOGIN_ATTEMPTS_PER_IP": "1000000000"}
+
+
+def configure_fake_backends(path: str):
+    # Must run before anything under app/ is imported
+    os.environ.update(BENCH_ENV)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ.setdefault("REDIS_URL", "redis://localhost/0")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ.setdefault("ALGORITHM", "HS256")
+
+    import fakeredis.aioredis
+    import redis.asyncio
+
+    fake = fakeredis.aioredis.FakeRedis()
+    redis.asyncio.from_url = lambda *args, **kwargs: fake
+
+    from sqlalchemy import create_engine
+
+    from app.db import models  # noqa: F401 (registers the tables)
+    from app.db.base import Base
+
+    if os.path.exists(path):
+        os.remove(path)
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+
+async def seed(run_id: str, accounts: int, boards: int, posts: int) -> dict:
+    from sqlalchemy import bindparam, insert, select, update
+
+    from app.core.security import get_password_hash
+    from app.db.models import Account, Board, Post
+    from app.db.session import AsyncSessionLocal
+
+    prefix = f"bench-{run_id}"
+    hashed_password = get_password_hash(PASSWORD)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(Account),
+            [
+                {
+                    "fullname": f"{prefix} {i}",
+                    "email": f"{prefix}-{i}@example.com",
+                    "hashed_password": hashed_password,
+                }
+                for i in range(accounts)
+            ],
+        )
+        result = await db.execute(
+            select(Account.id, Account.email).filter(Account.email.like(f"{prefix}-%"))
+        )
+        account_rows = result.all()
+
+        await db.execute(
+            insert(Board),
+            [
+                {
+                    "name": f"{prefix}-board-{i}",
+                    # The first board gets the deep pages and must be public
+                    "public": i == 0 or i % 4 != 0,
+                    "owner_id": account_rows[i % len(account_rows)].id,
+                    "post_count": 0,
+                }
+                for i in range(boards)
+            ],
+        )
+        result = await db.execute(
+            select(Board.id)
+            .filter(Board.name.like(f"{prefix}-board-%"))
+            .order_by(Board.id)
+        )
+        board_ids = result.scalars().all()
+        # Half of the posts go to the first board so pagination can go deep
+        big_board_id = board_ids[0]
+
+        counts = dict.fromkeys(board_ids, 0)
+        rows = []
+        for i in range(posts):
+            board_id = big_board_id if i % 2 == 0 else random.choice(board_ids)
+            counts[board_id] += 1
+            rows.append(
+                {
+                    "board_id": board_id,
+                    "title": f"{prefix} post {i}",
+                    "content": f"Benchmark post {i} " * 20,
+                    "owner_id": random.choice(account_rows).id,
+                }
+            )
+        for start in range(0, len(rows), 5000):
+            await db.execute(insert(Post), rows[start : start + 5000])
+        await db.execute(
+            update(Board)
+            .where(Board.id == bindparam("board_id"))
+            .values(post_count=bindparam("post_count"))
+            .execution_options(synchronize_session=False),
+            [
+                {"board_id": board_id, "post_count": count}
+                for board_id, count in counts.items()
+            ],
+        )
+        await db.commit()
+
+        result = await db.execute(
+            select(Post.id).filter(Post.board_id == big_board_id).order_by(Post.id)
+        )
+        big_board_post_ids = result.scalars().all()
+
+    return {
+        "emails": [row.email for row in account_rows],
+        "big_board_id": big_board_id,
+        "big_board_post_ids": big_board_post_ids,
+    }
+
+
+async def login(client, email: str):
+    response = await client.post(
+        "/api/v1/login", data={"username": email, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def make_workloads(seeded: dict, headers: list):
+    post_ids = seeded["big_board_post_ids"]
+    # Cursors from the back half of the board: pages at depth
+    deep_cursors = post_ids[len(post_ids) // 2 :] or [None]
+    boards_cursor = {"value": None}
+
+    async def login_request(client, i):
+        return await client.post(
+            "/api/v1/login",
+            data={"username": random.choice(seeded["emails"]), "password": PASSWORD},
+        )
+
+    async def posts_deep_request(client, i):
+        params = {"board_id": seeded["big_board_id"], "limit": 20}
+        cursor = random.choice(deep_cursors)
+        if cursor is not None:
+            params["cursor"] = cursor
+        return await client.get(
+            "/api/v1/posts", params=params, headers=headers[i % len(headers)]
+        )
+
+    async def boards_request(client, i):
+        # Walk the pages; start over after the last one
+        params = {"order_by_post_count": "true", "limit": 20}
+        if boards_cursor["value"]:
+            params["cursor"] = boards_cursor["value"]
+        response = await client.get(
+            "/api/v1/boards", params=params, headers=headers[i % len(headers)]
+        )
+        if response.status_code == 200:
+            boards_cursor["value"] = response.json()["next_cursor"]
+        return response
+
+    async def create_post_request(client, i):
+        post_in = {
+            "board_id": seeded["big_board_id"],
+            "title": f"Concurrent post {i}",
+            "content": "Written by the benchmark",
+        }
+        return await client.post(
+            "/api/v1/post", json=post_in, headers=headers[i % len(headers)]
+        )
+
+    return {
+        "login": login_request,
+        "posts_deep": posts_deep_request,
+        "boards_by_post_count": boards_request,
+        "create_posts": create_post_request,
+    }
+
+
+async def run_workload(client, request, total: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies, errors = [], 0
+    indexes = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in indexes:
+            started = time.perf_counter()
+            try:
+                response = await request(client, i)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, errors, elapsed)
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    percentiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else []
+    )
+
+    def percentile(p):
+        value = percentiles[p - 1] if percentiles else latencies[0]
+        return round(value * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def compare(results: dict, baseline: dict) -> None:
+    # Percentage change against the baseline run; negative latency is better
+    for name, result in results["workloads"].items():
+        before = baseline.get("workloads", {}).get(name)
+        if not before:
+            continue
+        result["vs_baseline"] = {
+            key: round((result[key] - before[key]) / before[key] * 100, 1)
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+            if before.get(key)
+        }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(workers: int):
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, **BENCH_ENV},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start within 30 seconds")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main_async(args) -> dict:
+    import httpx
+
+    run_id = uuid.uuid4().hex[:8]
+    seeded = await seed(run_id, args.accounts, args.boards, args.posts)
+
+    server = None
+    app = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        mode = "url"
+    elif args.workers:
+        server, base_url = start_uvicorn(args.workers)
+        client = httpx.AsyncClient(base_url=base_url, timeout=60)
+        mode = f"uvicorn x{args.workers}"
+    else:
+        from app.main import app
+
+        await app.router.startup()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        )
+        mode = "in-process"
+
+    results = {
+        "commit": git_commit(),
+        "mode": mode,
+        "fake_backends": args.fake_backends,
+        "config": {
+            "accounts": args.accounts,
+            "boards": args.boards,
+            "posts": args.posts,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "workloads": {},
+    }
+    try:
+        async with client:
+            emails = seeded["emails"][: max(1, min(args.concurrency, 16))]
+            headers = [await login(client, email) for email in emails]
+            workloads = make_workloads(seeded, headers)
+            for name in args.workloads:
+                results["workloads"][name] = await run_workload(
+                    client, workloads[name], args.requests, args.concurrency
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if app is not None:
+            await app.router.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="benchmark a running server")
+    target.add_argument(
+        "--workers", type=int, help="start uvicorn with this many workers"
+    )
+    parser.add_argument(
+        "--fake-backends",
+        action="store_true",
+        help="use SQLite and fakeredis instead of .env (in-process only)",
+    )
+    parser.add_argument("--sqlite-path", default="bench.sqlite")
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--boards", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS)
+    )
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    args = parser.parse_args()
+
+    if args.fake_backends:
+        if args.url or args.workers:
+            parser.error("--fake-backends only works in-process")
+        configure_fake_backends(args.sqlite_path)
+    else:
+        os.environ.update(BENCH_ENV)
+
+    results = asyncio.run(main_async(args))
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            compare(results, json.load(baseline_file))
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
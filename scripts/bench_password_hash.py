@@ -0,0 +1,81 @@
+"""Measure password hash/verify latency for candidate hashing policies.
+
+Run on the hardware you deploy to, then pick PASSWORD_HASH_SCHEME,
+BCRYPT_ROUNDS and the ARGON2_* settings from the results:
+
+    python -m scripts.bench_password_hash --bcrypt-rounds 10 11 12 13
+    python -m scripts.bench_password_hash --scheme argon2 \
+        --argon2-memory-cost 19456 65536 --argon2-time-cost 2 3
+
+The script needs the same environment (.env) as the application because it
+builds its contexts with app.core.security.build_pwd_context.
+"""
+import argparse
+import itertools
+import json
+import statistics
+import time
+
+from app.core.security import build_pwd_context
+
+
+def measure(context, iterations: int) -> dict:
+    password = "benchmark-password"
+    hashed_password = context.hash(password)
+    hash_times, verify_times = [], []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        context.hash(password)
+        hash_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        context.verify(password, hashed_password)
+        verify_times.append(time.perf_counter() - started)
+
+    return {
+        "hash_ms_p50": statistics.median(hash_times) * 1000,
+        "hash_ms_max": max(hash_times) * 1000,
+        "verify_ms_p50": statistics.median(verify_times) * 1000,
+        "verify_ms_max": max(verify_times) * 1000,
+        # 워커 스레드 하나가 초당 처리할 수 있는 로그인 수
+        "verifications_per_second_per_worker": 1 / statistics.median(verify_times),
+    }
+
+
+def policies(args):
+    if args.scheme == "bcrypt":
+        for rounds in args.bcrypt_rounds:
+            yield {"scheme": "bcrypt", "bcrypt_rounds": rounds}
+    else:
+        for memory_cost, time_cost, parallelism in itertools.product(
+            args.argon2_memory_cost, args.argon2_time_cost, args.argon2_parallelism
+        ):
+            yield {
+                "scheme": "argon2",
+                "argon2_memory_cost": memory_cost,
+                "argon2_time_cost": time_cost,
+                "argon2_parallelism": parallelism,
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument(
+        "--argon2-memory-cost", type=int, nargs="+", default=[19456, 65536]
+    )
+    parser.add_argument("--argon2-time-cost", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--argon2-parallelism", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    results = []
+    for policy in policies(args):
+        context = build_pwd_context(**policy)
+        results.append({**policy, **measure(context, args.iterations)})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import pytest
+
+from app.core.metrics import query_budget_listeners
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets():
+    # Every request made through the client must stay within the query
+    # budget declared on its route and must not repeat a statement (N+1).
+    violations = []
+    query_budget_listeners.append(violations.append)
+    yield violations
+    query_budget_listeners.remove(violations.append)
+    assert not violations, f"Query budget exceeded: {violations}"
@@ -1,6 +1,8 @@
 import pytest
 from fastapi import status
 
+from app.core.config import settings
+
 
 @pytest.fixture
 async def get_token_header(client, async_db_session):
@@ -101,3 +103,90 @@ async def test_list_boards(client, get_token_header):
     assert boards["total"] == 15
     assert len(boards["boards"]) == 5
     assert boards["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_boards_fast_json(client, get_token_header, monkeypatch):
+    headers = await get_token_header()
+    for i in range(3):
+        board_in = {"name": f"Test Board {i}", "public": True}
+        await client.post("/api/v1/board", json=board_in, headers=headers)
+    url = "/api/v1/boards?limit=2&order_by_post_count=true"
+
+    response = await client.get(url, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast_response = await client.get(url, headers=headers)
+
+    assert fast_response.status_code == status.HTTP_200_OK
+    assert fast_response.json() == response.json()
+    assert len(fast_response.json()["boards"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_boards_by_ids(client, get_token_header):
+    headers = await get_token_header()
+    public_response = await client.post(
+        "/api/v1/board", json={"name": "Public", "public": True}, headers=headers
+    )
+    private_response = await client.post(
+        "/api/v1/board", json={"name": "Private", "public": False}, headers=headers
+    )
+    public_id = public_response.json()["id"]
+    private_id = private_response.json()["id"]
+
+    account_in = {
+        "fullname": "Other User",
+        "email": "other@example.com",
+        "password": "password123",
+    }
+    await client.post("/api/v1/signup", json=account_in)
+    response = await client.post(
+        "/api/v1/login",
+        data={"username": "other@example.com", "password": "password123"},
+    )
+    other_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.get(
+        f"/api/v1/boards?ids={private_id},999999,{public_id}", headers=other_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    items = response.json()["items"]
+    assert [(item["id"], item["status"]) for item in items] == [
+        (private_id, "forbidden"),
+        (999999, "not_found"),
+        (public_id, "ok"),
+    ]
+    assert items[0]["board"] is None
+    assert items[2]["board"]["name"] == "Public"
+
+    response = await client.get("/api/v1/boards?ids=1,x", headers=other_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_metrics(client, get_token_header):
+    headers = await get_token_header()
+    board_in = {"name": "Test Board", "public": True}
+    create_response = await client.post("/api/v1/board", json=board_in, headers=headers)
+    await client.get(f"/api/v1/board/{create_response.json()['id']}", headers=headers)
+
+    response = await client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/board/{board_id}",status="200"}'
+        in response.text
+    )
+    assert 'http_request_db_queries_count{route="/api/v1/board/{board_id}"}' in (
+        response.text
+    )
+    assert "db_pool_connections" in response.text
+
+
+@pytest.mark.asyncio
+async def test_monitoring_endpoints_are_internal(client):
+    for path in ("/monitoring/db-pool", "/monitoring/password-hasher"):
+        response = await client.get(path)
+        assert response.status_code == status.HTTP_200_OK
+        # Not part of the public API
+        response = await client.get(f"/api/v1{path}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
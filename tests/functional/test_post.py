@@ -1,8 +1,15 @@
+import csv
+import io
+import json
+
 import pytest
 from fastapi import status
 
+from app.core.config import settings
 from app.repositories.board import BoardRepository
+from app.repositories.search import post_search_index
 from app.schemas.board import BoardCreate
+from app.utils.search_index import InvertedIndex
 
 
 @pytest.fixture
@@ -157,3 +164,176 @@ async def test_list_posts(client, create_board):
     assert posts["total"] == 15
     assert len(posts["posts"]) == 5
     assert posts["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_posts_without_total(client, create_board):
+    board, headers = await create_board()
+    post_in = {"board_id": board["id"], "title": "Test Post", "content": "Content"}
+    await client.post("/api/v1/post", json=post_in, headers=headers)
+
+    response = await client.get(
+        f"/api/v1/posts?board_id={board['id']}&include_total=false", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    posts = response.json()
+    assert posts["total"] is None
+    assert len(posts["posts"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_posts_summary(client, create_board):
+    board, headers = await create_board()
+    content = "가나다 " * settings.POST_EXCERPT_LENGTH
+    post_in = {"board_id": board["id"], "title": "Long Post", "content": content}
+    post = (await client.post("/api/v1/post", json=post_in, headers=headers)).json()
+
+    response = await client.get(
+        f"/api/v1/posts?board_id={board['id']}&fields=summary", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    posts = response.json()
+    assert posts["total"] == 1
+    assert posts["posts"] == [
+        {
+            "id": post["id"],
+            "board_id": board["id"],
+            "title": "Long Post",
+            "owner_id": post["owner_id"],
+            "excerpt": content[: settings.POST_EXCERPT_LENGTH],
+        }
+    ]
+
+    response = await client.get(
+        f"/api/v1/posts?board_id={board['id']}&fields=content", headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_list_posts_fast_json(client, create_board, monkeypatch):
+    board, headers = await create_board()
+    for i in range(3):
+        post_in = {"board_id": board["id"], "title": f"Post {i}", "content": "한글"}
+        await client.post("/api/v1/post", json=post_in, headers=headers)
+    url = f"/api/v1/posts?board_id={board['id']}&limit=2"
+
+    response = await client.get(url, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast_response = await client.get(url, headers=headers)
+
+    assert fast_response.status_code == status.HTTP_200_OK
+    assert fast_response.headers["content-type"] == "application/json"
+    assert fast_response.json() == response.json()
+
+
+@pytest.mark.asyncio
+async def test_create_posts_batch(client, create_board):
+    board, headers = await create_board()
+    batch_in = {
+        "posts": [
+            {"board_id": board["id"], "title": "First", "content": "Content"},
+            {"board_id": 999999, "title": "Lost", "content": "Content"},
+            {"board_id": board["id"], "title": "Second", "content": "Content"},
+        ]
+    }
+    response = await client.post("/api/v1/posts:batch", json=batch_in, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert [post["title"] for post in result["created"]] == ["First", "Second"]
+    assert result["errors"] == [
+        {"index": 1, "board_id": 999999, "error": "Board not found", "code": 4044}
+    ]
+
+    response = await client.get(f"/api/v1/board/{board['id']}", headers=headers)
+    assert response.json()["post_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_posts_by_ids(client, create_board):
+    board, headers = await create_board()
+    post_ids = []
+    for i in range(2):
+        post_in = {"board_id": board["id"], "title": f"Post {i}", "content": "Body"}
+        response = await client.post("/api/v1/post", json=post_in, headers=headers)
+        post_ids.append(response.json()["id"])
+
+    response = await client.get(
+        f"/api/v1/posts?ids={post_ids[1]},999999,{post_ids[0]}", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == ["ok", "not_found", "ok"]
+    assert items[0]["post"]["title"] == "Post 1"
+    assert items[2]["post"]["title"] == "Post 0"
+
+
+@pytest.mark.asyncio
+async def test_export_board(client, create_board):
+    board, headers = await create_board()
+    for i in range(3):
+        post_in = {"board_id": board["id"], "title": f"Post {i}", "content": "a,b"}
+        await client.post("/api/v1/post", json=post_in, headers=headers)
+
+    response = await client.get(f"/api/v1/board/{board['id']}/export", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["title"] for line in lines] == ["Post 0", "Post 1", "Post 2"]
+
+    response = await client.get(
+        f"/api/v1/board/{board['id']}/export?format=csv", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "board_id", "title", "content", "owner_id"]
+    assert rows[1][2:4] == ["Post 0", "a,b"]
+    assert len(rows) == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    not settings.DATABASE_URL.startswith("postgresql"),
+    reason="full-text search needs the Postgres search_vector migration",
+)
+async def test_search_posts(client, create_board):
+    board, headers = await create_board()
+    for title in ("Async database drivers", "Gardening tips", "Database indexes"):
+        post_in = {"board_id": board["id"], "title": title, "content": "Body"}
+        await client.post("/api/v1/post", json=post_in, headers=headers)
+
+    response = await client.get(
+        "/api/v1/posts/search?q=database&limit=1", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert len(first_page["posts"]) == 1
+    assert first_page["next_cursor"] is not None
+
+    response = await client.get(
+        f"/api/v1/posts/search?q=database&limit=1&cursor={first_page['next_cursor']}",
+        headers=headers,
+    )
+    second_page = response.json()
+    titles = {first_page["posts"][0]["title"], second_page["posts"][0]["title"]}
+    assert titles == {"Async database drivers", "Database indexes"}
+    assert second_page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_posts_in_memory(client, create_board, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "memory")
+    monkeypatch.setattr(post_search_index, "index", InvertedIndex())
+    board, headers = await create_board()
+    post_ids = {}
+    for title in ("Async database drivers", "Gardening tips", "Database indexes"):
+        post_in = {"board_id": board["id"], "title": title, "content": "Body"}
+        response = await client.post("/api/v1/post", json=post_in, headers=headers)
+        post_ids[title] = response.json()["id"]
+    await client.delete(f"/api/v1/post/{post_ids['Database indexes']}", headers=headers)
+
+    response = await client.get("/api/v1/posts/search?q=database", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert [post["title"] for post in result["posts"]] == ["Async database drivers"]
+    assert result["next_cursor"] is None
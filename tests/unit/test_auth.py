@@ -1,9 +1,33 @@
+import asyncio
+import time
+
 import pytest
+from fastapi import HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import dependencies
+from app.core.config import settings
+from app.core.security import (
+    PasswordHasher,
+    build_pwd_context,
+    get_password_hash,
+    pwd_context,
+    verify_password,
+)
 from app.repositories.account import AccountRepository
+from app.repositories.cache import mark_primary_sticky, primary_sticky_key
 from app.schemas.account import AccountCreate
-from app.services.auth import authenticate_account, create_session, destroy_session
+from app.services import auth
+from app.services.auth import (
+    authenticate_account,
+    cache_verified_token,
+    create_session,
+    destroy_session,
+    get_cached_account,
+    login_failures_key,
+    redis_client,
+    session_generation,
+)
 
 
 @pytest.fixture
@@ -44,3 +68,165 @@ async def test_destroy_session(create_test_account, async_db_session: AsyncSessi
     )
     await create_session(account_in.id)
     await destroy_session(account_in.id)
+
+
+@pytest.mark.asyncio
+async def test_destroy_session_evicts_cached_token(
+    create_test_account, async_db_session: AsyncSession
+):
+    account = await create_test_account(
+        email="test@example.com", password="password123"
+    )
+    access_token = await create_session(account.id)
+    cache_verified_token(
+        access_token, account, int(time.time()) + 60, session_generation()
+    )
+    assert get_cached_account(access_token) is account
+
+    await destroy_session(account.id)
+    assert get_cached_account(access_token) is None
+
+
+@pytest.mark.asyncio
+async def test_token_verified_before_logout_is_not_cached(
+    create_test_account, async_db_session: AsyncSession
+):
+    account = await create_test_account(
+        email="test@example.com", password="password123"
+    )
+    access_token = await create_session(account.id)
+    # A request reads the generation and sees the session in Redis...
+    generation = session_generation()
+    # ...then the user logs out before that request caches the token
+    await destroy_session(account.id)
+    cache_verified_token(access_token, account, int(time.time()) + 60, generation)
+    assert get_cached_account(access_token) is None
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_full():
+    hasher = PasswordHasher("thread", workers=1, max_pending=1)
+    hashed_password = await hasher.run(get_password_hash, "password123")
+    assert await hasher.run(verify_password, "password123", hashed_password)
+    assert hasher.stats()["completed"] == 2
+
+    hasher.max_pending = 0
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.run(get_password_hash, "password123")
+    assert exc_info.value.status_code == 503
+    assert hasher.stats()["rejected"] == 1
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_account_throttles_failures(
+    create_test_account, async_db_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings, "LOGIN_FAILURES_PER_EMAIL", 2)
+    await redis_client.delete(login_failures_key("throttle@example.com"))
+    await create_test_account(email="throttle@example.com", password="password123")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await authenticate_account(
+                async_db_session, "throttle@example.com", "wrong-password"
+            )
+        assert exc_info.value.status_code == 401
+
+    # 실패 횟수를 넘으면 올바른 비밀번호여도 bcrypt 검증 전에 거절됩니다.
+    with pytest.raises(HTTPException) as exc_info:
+        await authenticate_account(
+            async_db_session, "throttle@example.com", "password123"
+        )
+    assert exc_info.value.status_code == 429
+
+
+def test_get_client_ip_uses_forwarded_for_from_trusted_proxies(monkeypatch):
+    def request(peer, forwarded_for=None):
+        headers = (
+            [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+        )
+        return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+    # Without trusted proxies the header is ignored
+    assert dependencies.get_client_ip(request("10.0.0.5", "1.2.3.4")) == "10.0.0.5"
+
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+    assert dependencies.get_client_ip(request("10.0.0.5", "1.2.3.4")) == "1.2.3.4"
+    # Addresses the client put in front of its own are not trusted
+    assert (
+        dependencies.get_client_ip(request("10.0.0.5", "6.6.6.6, 1.2.3.4, 10.0.0.9"))
+        == "1.2.3.4"
+    )
+    # Only requests coming from a trusted proxy may set the client address
+    assert dependencies.get_client_ip(request("5.5.5.5", "1.2.3.4")) == "5.5.5.5"
+    assert dependencies.get_client_ip(request("10.0.0.5")) == "10.0.0.5"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_login_guesses_share_the_failure_limit(monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_FAILURES_PER_EMAIL", 2)
+    await redis_client.delete(login_failures_key("parallel@example.com"))
+
+    async def slow_lookup(db, email):
+        # Keep every guess in flight at once, like a slow password check
+        await asyncio.sleep(0.05)
+        return None
+
+    monkeypatch.setattr(AccountRepository, "get_by_email", slow_lookup)
+    results = await asyncio.gather(
+        *(
+            authenticate_account(None, "parallel@example.com", "guess")
+            for _ in range(5)
+        ),
+        return_exceptions=True,
+    )
+    statuses = sorted(result.status_code for result in results)
+    assert statuses == [401, 401, 429, 429, 429]
+
+
+@pytest.mark.asyncio
+async def test_authenticate_account_rehashes_outdated_hash(
+    create_test_account, async_db_session: AsyncSession, monkeypatch
+):
+    account = await create_test_account(
+        email="rehash@example.com", password="password123"
+    )
+    account.hashed_password = build_pwd_context(bcrypt_rounds=4).hash("password123")
+    await async_db_session.commit()
+
+    scheduled = []
+    monkeypatch.setattr(
+        auth,
+        "schedule_password_rehash",
+        lambda account_id, new_hash: scheduled.append((account_id, new_hash)),
+    )
+    await authenticate_account(async_db_session, "rehash@example.com", "password123")
+
+    assert len(scheduled) == 1
+    account_id, new_hash = scheduled[0]
+    assert account_id == account.id
+    assert not pwd_context.needs_update(new_hash)
+
+
+@pytest.mark.asyncio
+async def test_read_db_sticks_to_primary_after_write(
+    create_test_account, async_db_session: AsyncSession, monkeypatch
+):
+    account = await create_test_account("sticky@example.com", "password")
+    replica_session = object()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", "sqlite+aiosqlite://")
+    await redis_client.delete(primary_sticky_key(account.id))
+
+    read_db = dependencies.get_read_db(async_db_session, replica_session, account)
+    assert await read_db.__anext__() is replica_session
+
+    # Taking the write session alone (e.g. a write that fails validation)
+    # does not pin reads to the primary; a committed write does
+    assert await dependencies.get_write_db(async_db_session) is async_db_session
+    read_db = dependencies.get_read_db(async_db_session, replica_session, account)
+    assert await read_db.__anext__() is replica_session
+
+    await mark_primary_sticky(account.id)
+    read_db = dependencies.get_read_db(async_db_session, replica_session, account)
+    assert await read_db.__anext__() is async_db_session
@@ -1,9 +1,17 @@
+import asyncio
+
 import pytest
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models import Account
-from app.repositories.board import BoardRepository
+from app.db.redis import redis_client
+from app.repositories.board import BoardRepository, board_cache
+from app.repositories.cache import delayed_delete_tasks
 from app.schemas.board import BoardCreate, BoardUpdate
+from app.services.board import list_boards_service
+from app.utils.cursor import decode_cursor, encode_cursor
 
 
 @pytest.fixture
@@ -60,6 +68,36 @@ async def test_update_board(async_db_session: AsyncSession, create_test_board):
     assert updated_board.owner_id == board.owner_id
 
 
+@pytest.mark.asyncio
+async def test_get_board_cached_invalidated_on_update(
+    async_db_session: AsyncSession, create_test_board
+):
+    board = await create_test_board(name="Test Board")
+    cached_board = await BoardRepository.get_board_cached(async_db_session, board.id)
+    assert cached_board.name == "Test Board"
+
+    board_update = BoardUpdate(name="Updated Board", public=False)
+    await BoardRepository.update_board(
+        async_db_session, board_update, board.id, board.owner_id
+    )
+    cached_board = await BoardRepository.get_board_cached(async_db_session, board.id)
+    assert cached_board.name == "Updated Board"
+    assert cached_board.public is False
+
+
+@pytest.mark.asyncio
+async def test_board_cache_deleted_again_after_replica_lag(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", "sqlite+aiosqlite://")
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 0.01)
+    await board_cache.invalidate(1)
+    # A lagging replica read refills the key with the old row
+    await redis_client.set(board_cache.key(1), "stale")
+
+    await asyncio.gather(*delayed_delete_tasks)
+    assert await redis_client.get(board_cache.key(1)) is None
+    assert not delayed_delete_tasks
+
+
 @pytest.mark.asyncio
 async def test_delete_board(async_db_session: AsyncSession, create_test_board):
     board = await create_test_board(name="Test Board")
@@ -89,3 +127,76 @@ async def test_get_boards(async_db_session: AsyncSession, create_test_account):
     assert total == 15
     assert len(boards) == 5
     assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_boards_order_by_post_count(
+    async_db_session: AsyncSession, create_test_account
+):
+    for i in range(7):
+        board_in = BoardCreate(name=f"Test Board {i}", public=True)
+        board = await BoardRepository.create_board(
+            async_db_session, board_in, create_test_account.id
+        )
+        board.post_count = i % 3
+    await async_db_session.commit()
+
+    seen = []
+    next_cursor = None
+    while True:
+        _, boards, next_cursor = await BoardRepository.get_boards(
+            async_db_session,
+            create_test_account.id,
+            limit=3,
+            cursor=next_cursor,
+            order_by_post_count=True,
+        )
+        seen += [(board["post_count"], board["id"]) for board in boards]
+        if next_cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.parametrize(
+    "values", [("x", "y"), (1.5, 2), (True, 2), (1,), (1, 2, 3), ([1], 2)]
+)
+@pytest.mark.asyncio
+async def test_get_boards_rejects_malformed_cursor(
+    async_db_session: AsyncSession, create_test_account, values
+):
+    with pytest.raises(HTTPException) as exc_info:
+        await BoardRepository.get_boards(
+            async_db_session,
+            create_test_account.id,
+            cursor=encode_cursor(*values),
+            order_by_post_count=True,
+        )
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail["code"] == 4003
+
+
+def test_decode_cursor_accepts_int_for_float():
+    assert decode_cursor(encode_cursor(1, 2), (float, int)) == (1, 2)
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(float("nan"), 2), (float, int))
+
+
+@pytest.mark.asyncio
+async def test_list_boards_service_releases_connection(
+    async_db_session: AsyncSession, create_test_board
+):
+    board = await create_test_board(name="Test Board")
+    total, boards, _ = await list_boards_service(
+        board.owner_id, 10, None, 0, async_db_session, False
+    )
+    assert total == 1
+    assert not async_db_session.in_transaction()
+    assert boards[0] == {
+        "id": board.id,
+        "name": "Test Board",
+        "public": True,
+        "owner_id": board.owner_id,
+        "post_count": 0,
+    }
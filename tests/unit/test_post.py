@@ -1,10 +1,18 @@
+import asyncio
+
 import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models import Account, Board
 from app.repositories.board import BoardRepository
+from app.repositories.counter import post_count_buffer
 from app.repositories.post import PostRepository
 from app.schemas.post import PostCreate, PostUpdate
+from app.services.post import create_post_service
+from app.utils.search_index import InvertedIndex, tokenize
 
 
 @pytest.fixture
@@ -59,6 +67,109 @@ async def test_create_post(
     assert db_board.post_count == 1
 
 
+@pytest.mark.asyncio
+async def test_bulk_create_posts(
+    async_db_session: AsyncSession, create_test_account, create_test_board
+):
+    posts_in = [
+        PostCreate(board_id=create_test_board.id, title=f"Post {i}", content="Body")
+        for i in range(3)
+    ]
+    posts = await PostRepository.bulk_create_posts(
+        async_db_session, posts_in, create_test_account.id
+    )
+    assert [post.title for post in posts] == ["Post 0", "Post 1", "Post 2"]
+    assert all(post.owner_id == create_test_account.id for post in posts)
+
+    db_board = await BoardRepository.get_board(async_db_session, create_test_board.id)
+    await async_db_session.refresh(db_board)
+    assert db_board.post_count == 3
+
+
+@pytest.mark.asyncio
+async def test_create_post_checks_board_in_db_not_cache(
+    async_db_session: AsyncSession, create_test_board
+):
+    # Warm the cache, then make the board private without invalidating it,
+    # as a refill racing the invalidation would leave it
+    await BoardRepository.get_board_cached(async_db_session, create_test_board.id)
+    create_test_board.public = False
+    await async_db_session.commit()
+
+    post_in = PostCreate(board_id=create_test_board.id, title="Post", content="Body")
+    with pytest.raises(HTTPException) as exc_info:
+        await create_post_service(
+            post_in, create_test_board.owner_id + 1, async_db_session
+        )
+    assert exc_info.value.status_code == 403
+
+
+def test_bulk_insert_orders_ids_by_input_position():
+    rows = [
+        {"board_id": 1, "title": f"Post {i}", "content": "Body", "owner_id": 2}
+        for i in range(3)
+    ]
+    compiled = PostRepository.ordered_insert(rows).compile(
+        dialect=postgresql.asyncpg.dialect()
+    )
+    sql = " ".join(str(compiled).split())
+    assert "WITH ORDINALITY" in sql
+    assert "ORDER BY anon_1.ordinal RETURNING" in sql
+    # One array per column, however many rows
+    assert compiled.params["title"] == ["Post 0", "Post 1", "Post 2"]
+    assert len(compiled.params) == 4
+
+
+@pytest.mark.asyncio
+async def test_create_post_buffered_post_count(
+    async_db_session: AsyncSession, create_test_post, create_test_board, monkeypatch
+):
+    monkeypatch.setattr(settings, "POST_COUNT_MODE", "buffered")
+    await create_test_post(title="Test Post")
+
+    # 증감분은 Redis에만 쌓이고, 읽을 때 합산됩니다.
+    db_board = await BoardRepository.get_board(async_db_session, create_test_board.id)
+    assert db_board.post_count == 0
+    board = await BoardRepository.get_board_cached(
+        async_db_session, create_test_board.id
+    )
+    assert board.post_count == 1
+
+    await BoardRepository.flush_post_counts(async_db_session)
+    await async_db_session.refresh(db_board)
+    assert db_board.post_count == 1
+    board = await BoardRepository.get_board_cached(
+        async_db_session, create_test_board.id
+    )
+    assert board.post_count == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_deltas_until_commit(
+    async_db_session: AsyncSession, create_test_post, create_test_board, monkeypatch
+):
+    monkeypatch.setattr(settings, "POST_COUNT_MODE", "buffered")
+    await create_test_post(title="Test Post")
+
+    # The worker is cancelled (not an exception) while the UPDATE runs
+    async def cancelled_execute(*args, **kwargs):
+        raise asyncio.CancelledError
+
+    with monkeypatch.context() as patch:
+        patch.setattr(async_db_session, "execute", cancelled_execute)
+        with pytest.raises(asyncio.CancelledError):
+            await BoardRepository.flush_post_counts(async_db_session)
+
+    assert await post_count_buffer.pending([create_test_board.id]) == {
+        create_test_board.id: 1
+    }
+    await BoardRepository.flush_post_counts(async_db_session)
+    db_board = await BoardRepository.get_board(async_db_session, create_test_board.id)
+    await async_db_session.refresh(db_board)
+    assert db_board.post_count == 1
+    assert await post_count_buffer.pending_all() == {}
+
+
 @pytest.mark.asyncio
 async def test_get_post(async_db_session: AsyncSession, create_test_post):
     post = await create_test_post(title="Test Post")
@@ -69,6 +180,17 @@ async def test_get_post(async_db_session: AsyncSession, create_test_post):
     assert fetched_post.owner_id == post.owner_id
 
 
+@pytest.mark.asyncio
+async def test_get_post_with_board(
+    async_db_session: AsyncSession, create_test_post, create_test_board
+):
+    post = await create_test_post(title="Test Post")
+    row = await PostRepository.get_post_with_board(async_db_session, post.id)
+    assert row.Post.id == post.id
+    assert row.board_public is True
+    assert row.board_owner_id == create_test_board.owner_id
+
+
 @pytest.mark.asyncio
 async def test_update_post(async_db_session: AsyncSession, create_test_post):
     post = await create_test_post(title="Test Post")
@@ -83,6 +205,18 @@ async def test_update_post(async_db_session: AsyncSession, create_test_post):
     assert updated_post.owner_id == post.owner_id
 
 
+@pytest.mark.asyncio
+async def test_get_post_cached_invalidated_on_delete(
+    async_db_session: AsyncSession, create_test_post
+):
+    post = await create_test_post(title="Test Post")
+    cached_post = await PostRepository.get_post_cached(async_db_session, post.id)
+    assert cached_post.title == "Test Post"
+
+    await PostRepository.delete_post(async_db_session, post.id)
+    assert await PostRepository.get_post_cached(async_db_session, post.id) is None
+
+
 @pytest.mark.asyncio
 async def test_delete_post(
     async_db_session: AsyncSession, create_test_post, create_test_board
@@ -124,3 +258,20 @@ async def test_get_posts_by_board(
     assert total == 15
     assert len(posts) == 5
     assert next_cursor is None
+
+
+def test_inverted_index_bm25():
+    index = InvertedIndex()
+    index.add(1, tokenize("Async database drivers"))
+    index.add(2, tokenize("Gardening tips"))
+    index.add(3, tokenize("Database database indexes"))
+
+    assert [doc_id for _, doc_id in index.search(tokenize("DATABASE"))] == [3, 1]
+    assert [doc_id for _, doc_id in index.search(tokenize("database async"))] == [1]
+    assert index.search(tokenize("missing")) == []
+
+    index.remove(3)
+    index.add(1, tokenize("Gardening"))
+    assert index.search(tokenize("database")) == []
+    assert [doc_id for _, doc_id in index.search(tokenize("gardening"))] == [1, 2]
+    assert len(index) == 2